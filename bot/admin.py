@@ -1,16 +1,50 @@
 from django.contrib import admin
+from django.core.cache import cache
+from django.db.models import Count
 from django.utils.html import format_html
 
 from bot.models import (
+    ArchivedChatData,
     BotData,
+    Broadcast,
+    BroadcastDelivery,
     Certificate,
     ChatData,
     Customer,
     Impression,
+    OpenSupportApplication,
     Order,
+    Outbox,
     Faq,
     SupportApplication
 )
+from bot.filters import (
+    CachedCountsBooleanFilter,
+    CachedCountsChoicesFilter,
+    RecipientNameFilter,
+    TgUsernameFilter
+)
+from bot.pagination import KeysetPaginationMixin
+from bot.search import IndexedSearchMixin
+
+# Notifications of customers about the statuses of their orders.
+ORDER_STATUS_NOTICES = {
+    Order.RUSSIAN_LANGUAGE: {
+        'confirmed': 'Мы получили оплату заказа №{number} ✨',
+        'given_for_delivery': 'Заказ №{number} передан в доставку 🚚',
+        'delivered': (
+            'Заказ №{number} доставлен 🎁\n\nСпасибо, что выбрал(а) нас!'
+        ),
+    },
+    Order.ENGLISH_LANGUAGE: {
+        'confirmed': "We've received the payment for order #{number} ✨",
+        'given_for_delivery': 'Order #{number} is out for delivery 🚚',
+        'delivered': (
+            'Order #{number} has been delivered 🎁\n\n'
+            'Thank you for choosing us!'
+        ),
+    },
+}
 
 
 @admin.register(BotData)
@@ -20,13 +54,24 @@ class BotDataAdmin(admin.ModelAdmin):
 
 
 @admin.register(ChatData)
-class ChatDataAdmin(admin.ModelAdmin):
-    list_display = ('chat_id', 'called_at', 'data',)
-    search_fields = ('chat_id',)
+class ChatDataAdmin(
+    IndexedSearchMixin,
+    KeysetPaginationMixin,
+    admin.ModelAdmin
+):
+    keyset_ordering = '-called_at'
+    list_display = ('chat_id', 'called_at', 'next_state', 'language', 'data',)
+    search_number_fields = ('chat_id',)
+    search_help_text = 'ID чата'
+    list_filter = ('next_state', 'language')
     readonly_fields = (
         'chat_id',
         'start_at',
         'called_at',
+        'dropped_at',
+        'next_state',
+        'language',
+        'reminded_at',
         'data'
     )
 
@@ -40,6 +85,34 @@ class ChatDataAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(ArchivedChatData)
+class ArchivedChatDataAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    list_display = (
+        'chat_id', 'called_at', 'next_state', 'language', 'archived_at',
+    )
+    search_number_fields = ('chat_id',)
+    search_help_text = 'ID чата'
+    readonly_fields = (
+        'chat_id',
+        'start_at',
+        'called_at',
+        'next_state',
+        'language',
+        'archived_at',
+        'get_data'
+    )
+    exclude = ('compressed_data',)
+
+    def get_data(self, obj):
+        return obj.get_data()
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Impression)
 class ImpressionAdmin(admin.ModelAdmin):
     list_display = (
@@ -61,21 +134,64 @@ class CertificateInline(admin.TabularInline):
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(IndexedSearchMixin, KeysetPaginationMixin, admin.ModelAdmin):
     list_display = (
         'id', 'number', 'created_at', 'recipient_name', 'receiving_method',
         'confirmed', 'given_for_delivery', 'delivered'
     )
     list_display_links = ('id', 'created_at')
-    search_fields = ('id', 'number', 'recipient_name')
+    search_number_fields = ('id',)
+    search_prefix_fields = ('number',)
+    search_trigram_fields = ('recipient_name',)
+    search_help_text = 'ID, начало номера заказа или имени адресата'
     list_filter = (
-        'recipient_name', 'receiving_method', 'confirmed',
-        'given_for_delivery', 'delivered')
+        RecipientNameFilter,
+        ('receiving_method', CachedCountsChoicesFilter),
+        ('confirmed', CachedCountsBooleanFilter),
+        ('given_for_delivery', CachedCountsBooleanFilter),
+        ('delivered', CachedCountsBooleanFilter),
+    )
     readonly_fields = (
         'id', 'created_at', 'payment_screenshot', 'get_image_preview'
     )
     raw_id_fields = ('customer', 'impression')
     inlines = (CertificateInline,)
+    status_fields = ('confirmed', 'given_for_delivery', 'delivered')
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # The admin saves the form in a transaction, so the notifications
+        # are written only together with the order.
+        texts = (
+            ORDER_STATUS_NOTICES.get(obj.language)
+            or ORDER_STATUS_NOTICES[Order.RUSSIAN_LANGUAGE]
+        )
+        changed_fields = [
+            field
+            for field in self.status_fields
+            if field in form.changed_data
+        ]
+        # A cleared status cancels its notification if it isn't sent yet.
+        Outbox.objects.filter(
+            processed_at__isnull=True,
+            dedup_key__in=[
+                f'order-{obj.id}-{field}'
+                for field in changed_fields
+                if not getattr(obj, field)
+            ]
+        ).delete()
+        notifications = [
+            Outbox(
+                chat_id=obj.customer.chat_id,
+                text=texts[field].format(
+                    number=obj.number or obj.id
+                ),
+                dedup_key=f'order-{obj.id}-{field}'
+            )
+            for field in changed_fields
+            if getattr(obj, field)
+        ]
+        Outbox.objects.bulk_create(notifications, ignore_conflicts=True)
 
     def get_image_preview(self, obj):
         if not obj.id or not obj.payment_screenshot:
@@ -92,24 +208,87 @@ class OrderInline(admin.TabularInline):
 
 
 @admin.register(Customer)
-class CustomerAdmin(admin.ModelAdmin):
+class CustomerAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ('chat_id', 'tg_username', 'phone', 'fullname')
     list_display_links = ('chat_id', 'tg_username')
-    search_fields = ('chat_id', 'tg_nick', 'phone', 'fullname')
+    search_number_fields = ('chat_id',)
+    search_phone_fields = ('phone',)
+    search_prefix_fields = ('tg_username',)
+    search_trigram_fields = ('fullname',)
+    search_help_text = (
+        'ID чата, начало телефона, ника в Telegram или фамилии и имени'
+    )
     readonly_fields = ('chat_id', 'registered_at')
     inlines = (OrderInline,)
 
 
 @admin.register(SupportApplication)
-class SupportApplicationAdmin(admin.ModelAdmin):
+class SupportApplicationAdmin(
+    IndexedSearchMixin,
+    KeysetPaginationMixin,
+    admin.ModelAdmin
+):
+    keyset_ordering = '-registered_at'
     list_display = (
         'id', 'registered_at', 'request_type', 'tg_username', 'accepted',
         'closed'
     )
     list_display_links = ('id', 'registered_at', 'request_type')
-    list_filter = ('request_type', 'tg_username', 'accepted', 'closed')
-    search_fields = ('request_type', 'tg_nick')
+    list_filter = (
+        ('request_type', CachedCountsChoicesFilter),
+        TgUsernameFilter,
+        ('accepted', CachedCountsBooleanFilter),
+        ('closed', CachedCountsBooleanFilter),
+    )
+    search_number_fields = ('id', 'chat_id')
+    search_prefix_fields = ('tg_username',)
+    search_help_text = 'ID заявки, ID чата или начало ника в Telegram'
+    raw_id_fields = ('order', 'certificate')
+
+
+@admin.register(OpenSupportApplication)
+class OpenSupportApplicationAdmin(
+    IndexedSearchMixin,
+    KeysetPaginationMixin,
+    admin.ModelAdmin
+):
+    keyset_ordering = '-registered_at'
+    list_display = (
+        'id', 'registered_at', 'request_type', 'tg_username', 'accepted'
+    )
+    list_display_links = ('id', 'registered_at', 'request_type')
+    list_filter = ('request_type', 'accepted')
+    search_number_fields = ('id', 'chat_id')
+    search_help_text = 'ID заявки или ID чата'
     raw_id_fields = ('order', 'certificate')
+    counts_cache_key = 'open_support_applications_counts'
+    counts_cache_timeout = 60
+
+    def get_request_type_counts(self):
+        counts = cache.get(self.counts_cache_key)
+        if counts is None:
+            counts = dict(
+                OpenSupportApplication.objects.order_by()
+                .values_list('request_type')
+                .annotate(count=Count('id'))
+            )
+            cache.set(
+                self.counts_cache_key,
+                counts,
+                self.counts_cache_timeout
+            )
+        return counts
+
+    def changelist_view(self, request, extra_context=None):
+        counts = self.get_request_type_counts()
+        subtitle = ', '.join(
+            f'{request_type_name}: {counts[request_type]}'
+            for request_type, request_type_name
+            in SupportApplication.REQUEST_TYPES
+            if counts.get(request_type)
+        )
+        extra_context = {'subtitle': subtitle, **(extra_context or {})}
+        return super().changelist_view(request, extra_context)
 
 
 @admin.register(Faq)
@@ -123,11 +302,69 @@ class FaqAdmin(admin.ModelAdmin):
 
 
 @admin.register(Certificate)
-class CertificateAdmin(admin.ModelAdmin):
+class CertificateAdmin(
+    IndexedSearchMixin,
+    KeysetPaginationMixin,
+    admin.ModelAdmin
+):
+    keyset_ordering = '-expiry_date'
     list_display = (
         'certificate_id', 'start_date', 'expiry_date', 'activated_at',
         'blocked', 'used'
     )
     list_display_links = ('certificate_id', 'start_date', 'expiry_date')
-    search_fields = ('certificate_id', 'activated_at', 'blocked', 'used')
+    search_number_fields = ('certificate_id',)
+    search_help_text = 'ID сертификата'
     raw_id_fields = ('impression', 'order')
+
+
+@admin.register(Broadcast)
+class BroadcastAdmin(admin.ModelAdmin):
+    list_display = ('id', 'created_at', 'russian_text', 'finished_at')
+    list_display_links = ('id', 'created_at')
+    readonly_fields = (
+        'created_at', 'started_at', 'finished_at', 'last_chat_id'
+    )
+
+
+@admin.register(BroadcastDelivery)
+class BroadcastDeliveryAdmin(admin.ModelAdmin):
+    list_display = ('broadcast', 'chat_id', 'status', 'sent_at', 'error')
+    list_filter = ('status',)
+    search_fields = ('chat_id',)
+    raw_id_fields = ('broadcast',)
+    readonly_fields = (
+        'broadcast',
+        'chat_id',
+        'reserved_at',
+        'status',
+        'message_id',
+        'error',
+        'sent_at'
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Outbox)
+class OutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'created_at', 'chat_id', 'processed_at', 'error')
+    list_display_links = ('id', 'created_at')
+    search_fields = ('chat_id',)
+    readonly_fields = (
+        'created_at',
+        'chat_id',
+        'text',
+        'processed_at',
+        'error'
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
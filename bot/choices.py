@@ -0,0 +1,19 @@
+# Steps of the dialogue with a chat, kept in ChatData.next_state.
+(START, SELECTING_LANGUAGE, MAIN_MENU, SELECTING_IMPRESSIONS_CATEGORY,
+ SELECTING_IMPRESSION, SELECTING_RECEIVING_METHOD, WAITING_CUSTOMER_EMAIL,
+ ACQUAINTED_PRIVACY_POLICY, WAITING_CUSTOMER_FULLNAME, WAITING_CUSTOMER_PHONE,
+ WAITING_CUSTOMER_CONFIRMATION, WAITING_PAYMENT_SCREENSHOT, DIALOGUE_END,
+ SELECTING_DELIVERY_METHOD, WAITING_RECIPIENT_NAME,
+ WAITING_RECIPIENT_CONTACT, WAITING_RECIPIENT_CONFIRMATION,
+ CONFIRMING_SELF_DELIVERY, WAITING_CERTIFICATE_ID, WRONG_CERTIFICATE_MENU,
+ SELECTING_QUESTION) = range(1, 22)
+
+# Languages of the chats with their buttons. ChatData.language keeps
+# their positions, so new languages must be added to the end.
+LANGUAGES = {
+    'russian': '🇷🇺 Русский',
+    'english': '🇬🇧 English',
+}
+LANGUAGE_NUMBERS = {
+    language: number for number, language in enumerate(LANGUAGES, 1)
+}
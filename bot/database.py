@@ -1,23 +1,59 @@
 import io
 from asgiref.sync import sync_to_async
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from pytz import timezone
 
 from django.conf import settings
 from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.db import transaction
+from django.db.models import F, Q
 
+from .choices import LANGUAGE_NUMBERS
 from .models import (
     BotData,
+    Broadcast,
+    BroadcastDelivery,
     Certificate,
+    ChatData,
     Customer,
     Faq,
     Impression,
     Order,
+    Outbox,
     SupportApplication
 )
 
 
+def get_application_notice(application: SupportApplication) -> str:
+    """Return the operator notification about SupportApplication."""
+    lines = [
+        f'Новая заявка №{application.id}: '
+        f'{application.get_request_type_display()}',
+        f'Telegram: @{application.tg_username} (чат {application.chat_id})'
+    ]
+    if application.order:
+        order_number = application.order.number or application.order.id
+        lines.append(f'Заказ №{order_number}')
+    if application.certificate:
+        lines.append(
+            f'Сертификат {application.certificate.certificate_id}'
+        )
+    return '\n'.join(lines)
+
+
+def create_application(**fields) -> SupportApplication:
+    """Create SupportApplication and the operator notification of it."""
+    with transaction.atomic():
+        application = SupportApplication.objects.create(**fields)
+        if settings.TELEGRAM_OPERATOR_CHAT_ID:
+            Outbox.objects.create(
+                chat_id=settings.TELEGRAM_OPERATOR_CHAT_ID,
+                text=get_application_notice(application)
+            )
+    return application
+
+
 class Database():
     """Transfer data asynchronously between the database and the bot."""
     @sync_to_async
@@ -55,7 +91,7 @@ class Database():
             if language == 'russian'
             else SupportApplication.ENGLISH_LANGUAGE
         )
-        SupportApplication.objects.create(
+        create_application(
             chat_id=int(chat_id),
             tg_username=tg_username,
             language=application_language,
@@ -73,6 +109,38 @@ class Database():
             'impression_name': impression_name
         }
 
+    @sync_to_async
+    def claim_abandoned_chats(
+        self,
+        states: List[int],
+        idle_since: datetime,
+        limit: int
+    ) -> List[Tuple[int, Optional[int]]]:
+        """Mark at most limit chats stopped in the states as reminded.
+
+        A chat is claimed once per stop: it can be claimed again only
+        after it has talked to the bot. Returns the ids and the languages
+        of the claimed chats.
+        """
+        with transaction.atomic():
+            chats = ChatData.objects.filter(
+                Q(reminded_at__isnull=True) |
+                Q(reminded_at__lt=F('called_at')),
+                next_state__in=states,
+                called_at__lt=idle_since
+            )
+            claimed_chats = list(
+                chats.select_for_update(skip_locked=True)
+                .order_by('called_at')
+                .values_list('chat_id', 'language')[:limit]
+            )
+            ChatData.objects.filter(
+                chat_id__in=[chat_id for chat_id, _ in claimed_chats]
+            ).update(
+                reminded_at=datetime.now(tz=timezone(settings.TIME_ZONE))
+            )
+        return claimed_chats
+
     @sync_to_async
     def create_order(
         self,
@@ -146,7 +214,7 @@ class Database():
             if email_receiving
             else SupportApplication.GIFTBOX_ORDER
         )
-        SupportApplication.objects.create(
+        create_application(
             chat_id=chat_id,
             tg_username=tg_username,
             language=application_language,
@@ -173,13 +241,63 @@ class Database():
             if request_type == 'activation_problem'
             else SupportApplication.QUESTION_FOR_OPERATOR
         )
-        SupportApplication.objects.create(
+        create_application(
             chat_id=int(chat_id),
             tg_username=tg_username,
             language=application_language,
             request_type=application_request_type,
         )
 
+    @sync_to_async
+    def get_broadcast_batch(self, limit: int) -> Optional[Dict]:
+        """Reserve the next chats of the oldest unfinished broadcast.
+
+        Pending deliveries are saved together with the broadcast progress
+        before the messages are sent, so delivery is at-most-once: chats
+        never get the broadcast twice, even after a restart, but chats
+        reserved before a crash may not get it at all, see
+        mark_stale_broadcast_deliveries. Returns None if all the broadcasts
+        are finished.
+        """
+        with transaction.atomic():
+            broadcast = Broadcast.objects.select_for_update().filter(
+                finished_at__isnull=True
+            ).order_by('created_at').first()
+            if not broadcast:
+                return None
+
+            now = datetime.now(tz=timezone(settings.TIME_ZONE))
+            chats = list(
+                ChatData.objects.filter(chat_id__gt=broadcast.last_chat_id)
+                .order_by('chat_id')
+                .values_list('chat_id', 'language')[:limit]
+            )
+            if chats:
+                BroadcastDelivery.objects.bulk_create(
+                    [
+                        BroadcastDelivery(broadcast=broadcast, chat_id=chat_id)
+                        for chat_id, _ in chats
+                    ],
+                    ignore_conflicts=True
+                )
+                broadcast.last_chat_id = chats[-1][0]
+                broadcast.started_at = broadcast.started_at or now
+            else:
+                broadcast.finished_at = now
+            broadcast.save()
+
+        texts = {
+            LANGUAGE_NUMBERS['russian']: broadcast.russian_text,
+            LANGUAGE_NUMBERS['english']: broadcast.english_text,
+        }
+        return {
+            'broadcast_id': broadcast.id,
+            'messages': [
+                (chat_id, texts.get(language) or broadcast.russian_text)
+                for chat_id, language in chats
+            ]
+        }
+
     @sync_to_async
     def get_faq_details(self, language: str) -> List[Dict]:
         """Get faq questions from database."""
@@ -202,64 +320,54 @@ class Database():
         ]
 
     @sync_to_async
-    def get_impression(self, impression_id: int, language: str) -> Dict:
-        """Get impression from database."""
-        impression = Impression.objects.filter(
-            id=int(impression_id)
-        ).first()
-        if not impression:
-            return {}
+    def get_idle_chats(
+        self,
+        idle_since: datetime,
+        limit: int,
+        skipped_ids: List[int]
+    ) -> List[int]:
+        """Get ids of at most limit chats in memory idle since idle_since.
 
-        if language == 'russian':
-            return {
-                'id': impression.id,
-                'name': impression.name,
-                'price': f'{impression.price_in_rubles} ₽'
-            }
-        return {
-            'id': impression.id,
-            'name': impression.english_name,
-            'price': f'{impression.price_in_euros} €'
-        }
+        Chats not dropped from memory of the bot are returned, the longest
+        idle first, except the skipped ones.
+        """
+        return list(
+            ChatData.objects.filter(
+                called_at__lt=idle_since,
+                dropped_at__isnull=True
+            )
+            .exclude(chat_id__in=skipped_ids)
+            .order_by('called_at')
+            .values_list('chat_id', flat=True)[:limit]
+        )
 
     @sync_to_async
-    def get_impressions(
-        self,
-        language: str,
-        impressions_category: str
-    ) -> List[Dict]:
-        """Get impressions from database."""
-        if impressions_category == 'man':
-            impressions = Impression.objects.filter(for_men=True)
-        elif impressions_category == 'girl':
-            impressions = Impression.objects.filter(for_girls=True)
-        elif impressions_category == 'couple':
-            impressions = Impression.objects.filter(for_couples=True)
-        elif impressions_category == 'all':
-            impressions = Impression.objects.filter(for_all=True)
-        else:
-            return []
-
-        if language == 'russian':
-            return [
-                {
-                    'id': impression.id,
-                    'name': impression.name,
-                    'price': f'{impression.price_in_rubles} ₽',
-                    'url': impression.url_for_russians
-                }
-                for impression in impressions
-            ]
+    def get_impressions_catalog(self) -> List[Dict]:
+        """Get all impressions with their categories from database."""
+        return list(
+            Impression.objects.values(
+                'id',
+                'name',
+                'english_name',
+                'price_in_rubles',
+                'price_in_euros',
+                'url_for_russians',
+                'url_for_english',
+                'for_men',
+                'for_girls',
+                'for_couples',
+                'for_all'
+            )
+        )
 
-        return [
-            {
-                'id': impression.id,
-                'name': impression.english_name,
-                'price': f'{impression.price_in_euros} €',
-                'url': impression.url_for_english
-            }
-            for impression in impressions
-        ]
+    @sync_to_async
+    def get_outbox_messages(self, limit: int) -> List[Dict]:
+        """Get the oldest Outbox messages which are not processed yet."""
+        return list(
+            Outbox.objects.filter(processed_at__isnull=True)
+            .order_by('created_at')
+            .values('id', 'chat_id', 'text')[:limit]
+        )
 
     @sync_to_async
     def get_payment_details(self, language: str) -> str:
@@ -293,3 +401,63 @@ class Database():
             'address': bot[0].english_self_delivery_address,
             'opening_hours': bot[0].english_self_delivery_hours
         }
+
+    @sync_to_async
+    def mark_outbox_messages_processed(
+        self,
+        messages_ids: List[int],
+        error: str = ''
+    ) -> None:
+        """Mark Outbox messages as sent or as failed with the error."""
+        Outbox.objects.filter(id__in=messages_ids).update(
+            processed_at=datetime.now(tz=timezone(settings.TIME_ZONE)),
+            error=error[:256]
+        )
+
+    @sync_to_async
+    def mark_stale_broadcast_deliveries(
+        self,
+        reserved_before: datetime
+    ) -> int:
+        """Mark deliveries pending since reserved_before as unconfirmed.
+
+        They were reserved, but their results were never saved, e.g.
+        because the bot stopped while sending them, so they may have been
+        sent or not. They are not sent again. Returns their number.
+        """
+        return BroadcastDelivery.objects.filter(
+            status=BroadcastDelivery.PENDING,
+            reserved_at__lt=reserved_before
+        ).update(
+            status=BroadcastDelivery.UNCONFIRMED,
+            error='The result of sending was not saved'
+        )
+
+    @sync_to_async
+    def save_broadcast_deliveries(
+        self,
+        broadcast_id: int,
+        results: List[Tuple[int, Optional[int], str]]
+    ) -> None:
+        """Save the message ids or the errors of the broadcast deliveries."""
+        sent_at = datetime.now(tz=timezone(settings.TIME_ZONE))
+        deliveries = {
+            delivery.chat_id: delivery
+            for delivery in BroadcastDelivery.objects.filter(
+                broadcast_id=broadcast_id,
+                chat_id__in=[chat_id for chat_id, _, _ in results]
+            )
+        }
+        for chat_id, message_id, error in results:
+            delivery = deliveries[chat_id]
+            delivery.message_id = message_id
+            delivery.error = error[:256]
+            if message_id:
+                delivery.status = BroadcastDelivery.SENT
+                delivery.sent_at = sent_at
+            else:
+                delivery.status = BroadcastDelivery.FAILED
+        BroadcastDelivery.objects.bulk_update(
+            deliveries.values(),
+            ['message_id', 'error', 'status', 'sent_at']
+        )
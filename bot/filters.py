@@ -0,0 +1,114 @@
+from django.contrib import admin
+from django.core.cache import cache
+from django.db.models import Count
+
+
+class InputFilter(admin.SimpleListFilter):
+    """Filter by the beginning of the value typed into an input.
+
+    Unlike the default filter of a field, it doesn't read the distinct
+    values of the field to render the sidebar.
+    """
+
+    template = 'admin/bot/input_filter.html'
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        if not self.value():
+            return queryset
+        return queryset.filter(
+            **{f'{self.parameter_name}__startswith': self.value()}
+        )
+
+    def choices(self, changelist):
+        yield {
+            'value': self.value() or '',
+            'hidden_params': [
+                (name, value)
+                for name, value in changelist.params.items()
+                if name != self.parameter_name
+            ],
+        }
+
+
+class RecipientNameFilter(InputFilter):
+    title = 'имени адресата'
+    parameter_name = 'recipient_name'
+
+
+class TgUsernameFilter(InputFilter):
+    title = 'нику в Telegram'
+    parameter_name = 'tg_username'
+
+
+class CachedCountsMixin:
+    """Show the cached number of all the rows with every choice.
+
+    The counts are of the whole table, other filters and the search
+    don't change them, so they are labelled as totals. Subclasses define
+    get_choices_values, the values of the choices after "All".
+    """
+
+    counts_cache_timeout = 5 * 60
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.model = model
+        super().__init__(
+            field, request, params, model, model_admin, field_path
+        )
+
+    def get_counts(self):
+        cache_key = (
+            f'admin_filter_counts:{self.model._meta.label_lower}:'
+            f'{self.field_path}'
+        )
+        counts = cache.get(cache_key)
+        if counts is None:
+            counts = dict(
+                self.model._default_manager.order_by()
+                .values_list(self.field_path)
+                .annotate(count=Count('pk'))
+            )
+            cache.set(cache_key, counts, self.counts_cache_timeout)
+        return counts
+
+    def choices(self, changelist):
+        counts = self.get_counts()
+        choices_counts = [sum(counts.values())] + [
+            counts.get(value, 0) for value in self.get_choices_values()
+        ]
+        choices = super().choices(changelist)
+        for choice, count in zip(choices, choices_counts):
+            yield {
+                **choice,
+                'display': f"{choice['display']} (всего {count})"
+            }
+
+
+class CachedCountsBooleanFilter(
+    CachedCountsMixin,
+    admin.BooleanFieldListFilter
+):
+    def get_choices_values(self):
+        values = [True, False]
+        if self.field.null:
+            values.append(None)
+        return values
+
+
+class CachedCountsChoicesFilter(
+    CachedCountsMixin,
+    admin.ChoicesFieldListFilter
+):
+    def get_choices_values(self):
+        values = [
+            value for value, _ in self.field.flatchoices if value is not None
+        ]
+        if len(values) < len(self.field.flatchoices):
+            values.append(None)
+        return values
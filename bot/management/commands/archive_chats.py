@@ -0,0 +1,136 @@
+import json
+import time
+import zlib
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from bot.models import ArchivedChatData, ChatData
+
+
+class Command(BaseCommand):
+    help = (
+        'Move chats idle for a long time and dropped from memory of the bot '
+        'to the compressed archive'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Archive chats idle for more days than this'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of chats moved in one transaction'
+        )
+        parser.add_argument(
+            '--delay',
+            type=float,
+            default=0,
+            help='Pause between batches in seconds'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the chats and their compressed size'
+        )
+
+    def handle(self, *args, **options):
+        idle_since = timezone.now() - timedelta(days=options['days'])
+        dry_run = options['dry_run']
+
+        chats_count = 0
+        data_size = 0
+        compressed_size = 0
+        last_chat = None
+        started_at = time.monotonic()
+        while True:
+            with transaction.atomic():
+                chats = self.get_batch(
+                    idle_since,
+                    last_chat,
+                    options['batch_size'],
+                    lock=not dry_run
+                )
+                if not chats:
+                    break
+
+                archived_chats = []
+                for chat in chats:
+                    data = json.dumps(chat.data, ensure_ascii=False).encode()
+                    archived_chat = ArchivedChatData(
+                        chat_id=chat.chat_id,
+                        start_at=chat.start_at,
+                        called_at=chat.called_at,
+                        next_state=chat.next_state,
+                        language=chat.language,
+                        compressed_data=zlib.compress(data, 9)
+                    )
+                    archived_chats.append(archived_chat)
+                    data_size += len(data)
+                    compressed_size += len(archived_chat.compressed_data)
+
+                if not dry_run:
+                    self.archive(archived_chats)
+
+            chats_count += len(chats)
+            last_chat = chats[-1]
+            seconds = max(time.monotonic() - started_at, 1e-3)
+            self.stdout.write(
+                f'{chats_count} chats, '
+                f'{chats_count / seconds:.0f} chats per second'
+            )
+            if options['delay']:
+                time.sleep(options['delay'])
+
+        seconds = time.monotonic() - started_at
+        action = 'Would archive' if dry_run else 'Archived'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} {chats_count} chats in {seconds:.1f} s, '
+            f'{data_size} bytes of data compressed to {compressed_size}'
+        ))
+
+    def get_batch(self, idle_since, last_chat, batch_size, lock):
+        # The bot reads dropped chats from the database or, if they are
+        # archived, from the archive. Chats in memory of the bot are saved
+        # by it at any time, so they are never archived.
+        chats = ChatData.objects.filter(
+            called_at__lt=idle_since,
+            dropped_at__isnull=False
+        )
+        # Page by called_at and chat_id, so a dry run moves forward too.
+        if last_chat:
+            chats = chats.filter(
+                Q(called_at__gt=last_chat.called_at) |
+                Q(called_at=last_chat.called_at, chat_id__gt=last_chat.chat_id)
+            )
+        if lock:
+            chats = chats.select_for_update()
+        chats = chats.order_by('called_at', 'chat_id')
+        return list(chats[:batch_size])
+
+    def archive(self, archived_chats):
+        ArchivedChatData.objects.bulk_create(
+            archived_chats,
+            update_conflicts=True,
+            unique_fields=['chat_id'],
+            update_fields=[
+                'start_at',
+                'called_at',
+                'next_state',
+                'language',
+                'archived_at',
+                'compressed_data'
+            ]
+        )
+        ChatData.objects.filter(
+            chat_id__in=[chat.chat_id for chat in archived_chats],
+            dropped_at__isnull=False
+        ).delete()
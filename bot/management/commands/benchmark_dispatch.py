@@ -0,0 +1,40 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from bot_utilities.handlers import TRANSITIONS, handle_unknown_button
+from bot_utilities.transitions import resolve_handler
+
+
+class Command(BaseCommand):
+    help = 'Measure the cost of finding a handler for an update'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--number',
+            type=int,
+            default=100000,
+            help='Number of lookups for every transition'
+        )
+
+    def handle(self, *args, **options):
+        number = options['number']
+        lookups = list(TRANSITIONS)
+        lookups.append((lookups[0][0], 'callback', 'unknown_button'))
+
+        def dispatch():
+            for state, input_kind, data in lookups:
+                resolve_handler(
+                    TRANSITIONS,
+                    state,
+                    input_kind,
+                    data,
+                    default=handle_unknown_button
+                )
+
+        seconds = min(timeit.repeat(dispatch, number=number, repeat=5))
+        nanoseconds = seconds / (number * len(lookups)) * 1e9
+        self.stdout.write(
+            f'{len(TRANSITIONS)} transitions, '
+            f'{nanoseconds:.0f} ns per update dispatch'
+        )
@@ -0,0 +1,35 @@
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = 'Create the trigram indexes of the names searched in the admin'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Trigram indexes need PostgreSQL')
+
+        quote_name = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            for model, model_admin in admin.site._registry.items():
+                if model._meta.proxy:
+                    continue
+                for field_name in getattr(
+                    model_admin,
+                    'search_trigram_fields',
+                    ()
+                ):
+                    table = model._meta.db_table
+                    column = model._meta.get_field(field_name).column
+                    index_name = f'{table}_{column}_trgm'
+                    # CONCURRENTLY doesn't lock the table for writes.
+                    cursor.execute(
+                        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                        f'{quote_name(index_name)} ON {quote_name(table)} '
+                        f'USING gin ({quote_name(column)} gin_trgm_ops)'
+                    )
+                    self.stdout.write(f'Created {index_name}')
+
+        self.stdout.write(self.style.SUCCESS('Trigram indexes are ready'))
@@ -0,0 +1,65 @@
+import json
+import time
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Post recorded Telegram updates to the webhook'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='JSON file with a list of updates or one update per line'
+        )
+        parser.add_argument(
+            '--url',
+            default='http://127.0.0.1:8000/telegram/webhook/',
+            help='Webhook url'
+        )
+        parser.add_argument(
+            '--delay',
+            type=float,
+            default=0,
+            help='Pause between updates in seconds'
+        )
+
+    def handle(self, *args, **options):
+        updates = self.read_updates(options['path'])
+        headers = {'Content-Type': 'application/json'}
+        if settings.TELEGRAM_WEBHOOK_SECRET:
+            headers['X-Telegram-Bot-Api-Secret-Token'] = (
+                settings.TELEGRAM_WEBHOOK_SECRET
+            )
+
+        started_at = time.monotonic()
+        for update in updates:
+            request = Request(
+                options['url'],
+                data=json.dumps(update).encode(),
+                headers=headers,
+                method='POST'
+            )
+            try:
+                with urlopen(request) as response:
+                    status = response.status
+            except HTTPError as error:
+                status = error.code
+            self.stdout.write(f"Update {update.get('update_id')}: {status}")
+            time.sleep(options['delay'])
+
+        elapsed = time.monotonic() - started_at
+        self.stdout.write(f'Posted {len(updates)} updates in {elapsed:.2f} s')
+
+    def read_updates(self, path):
+        with open(path, encoding='utf-8') as file:
+            content = file.read().strip()
+        try:
+            if content.startswith('['):
+                return json.loads(content)
+            return [json.loads(line) for line in content.splitlines() if line]
+        except ValueError as error:
+            raise CommandError(f'Wrong updates file: {error}')
@@ -1,6 +1,11 @@
+import json
+import zlib
+
 from django.db import models
 from phonenumber_field.modelfields import PhoneNumberField
 
+from bot import choices
+
 
 class BotData(models.Model):
     bot_name = models.CharField('Название бота', max_length=256)
@@ -51,6 +56,17 @@ class BotData(models.Model):
 
 
 class ChatData(models.Model):
+    LANGUAGES = [
+        (number, choices.LANGUAGES[language])
+        for language, number in choices.LANGUAGE_NUMBERS.items()
+    ]
+
+    STATES = [
+        (number, name)
+        for name, number in vars(choices).items()
+        if name.isupper() and isinstance(number, int)
+    ]
+
     chat_id = models.PositiveBigIntegerField(
         'ID чата',
         primary_key=True,
@@ -64,16 +80,85 @@ class ChatData(models.Model):
     called_at = models.DateTimeField(
         'Последний раз общался с ботом',
         auto_now=True,
+    )
+    dropped_at = models.DateTimeField(
+        'Выгружен из памяти бота',
+        null=True,
+        blank=True,
+    )
+    next_state = models.PositiveSmallIntegerField(
+        'Шаг диалога',
+        choices=STATES,
+        null=True,
+        blank=True,
+    )
+    language = models.PositiveSmallIntegerField(
+        'Язык',
+        choices=LANGUAGES,
+        null=True,
+        blank=True,
         db_index=True,
     )
+    reminded_at = models.DateTimeField(
+        'Получил напоминание о заказе',
+        null=True,
+        blank=True,
+    )
     data = models.JSONField()
 
     class Meta:
         ordering = ['-called_at']
+        indexes = [
+            models.Index(
+                fields=['-called_at', '-chat_id'],
+                name='chat_data_called_at',
+            ),
+            models.Index(
+                fields=['next_state', 'called_at'],
+                name='chat_data_state_called_at',
+            ),
+        ]
         verbose_name = 'чат'
         verbose_name_plural = 'чаты'
 
 
+class ArchivedChatData(models.Model):
+    chat_id = models.PositiveBigIntegerField(
+        'ID чата',
+        primary_key=True,
+        null=False,
+        blank=False
+    )
+    start_at = models.DateTimeField('Впервые обратился к боту')
+    called_at = models.DateTimeField('Последний раз общался с ботом')
+    next_state = models.PositiveSmallIntegerField(
+        'Шаг диалога',
+        choices=ChatData.STATES,
+        null=True,
+        blank=True,
+    )
+    language = models.PositiveSmallIntegerField(
+        'Язык',
+        choices=ChatData.LANGUAGES,
+        null=True,
+        blank=True,
+    )
+    archived_at = models.DateTimeField(
+        'Перенесён в архив',
+        auto_now=True,
+        db_index=True,
+    )
+    compressed_data = models.BinaryField('Данные чата, сжатые zlib')
+
+    class Meta:
+        ordering = ['-archived_at']
+        verbose_name = 'архивный чат'
+        verbose_name_plural = 'архивные чаты'
+
+    def get_data(self):
+        return json.loads(zlib.decompress(self.compressed_data))
+
+
 class Impression(models.Model):
     number = models.PositiveIntegerField(r'№ п/п', unique=True)
     name = models.CharField('Наименование по-русски', max_length=256)
@@ -104,9 +189,17 @@ class Customer(models.Model):
         blank=False
     )
     registered_at = models.DateTimeField('Зарегистрирован', auto_now_add=True)
-    tg_username = models.CharField('Ник в Telegram', max_length=256)
+    tg_username = models.CharField(
+        'Ник в Telegram',
+        max_length=256,
+        db_index=True
+    )
     email = models.EmailField('Email', default='', blank=True)
-    fullname = models.CharField('Фамилия и имя', max_length=256)
+    fullname = models.CharField(
+        'Фамилия и имя',
+        max_length=256,
+        db_index=True
+    )
     phone = PhoneNumberField(
         'Нормализованный номер телефона',
         blank=True,
@@ -143,7 +236,11 @@ class Order(models.Model):
     ]
 
     number = models.CharField(
-        'Номер заказа', max_length=128, default='', blank=True
+        'Номер заказа',
+        max_length=128,
+        default='',
+        blank=True,
+        db_index=True
     )
     created_at = models.DateTimeField('Создан', auto_now_add=True)
     impression = models.ForeignKey(
@@ -166,7 +263,8 @@ class Order(models.Model):
     )
     recipient_name = models.CharField(
         'Имя адресата',
-        max_length=256
+        max_length=256,
+        db_index=True
     )
     recipient_contact = models.CharField('Контакты адресата', max_length=256)
     receiving_method = models.CharField(
@@ -223,6 +321,12 @@ class Certificate(models.Model):
 
     class Meta:
         ordering = ['-expiry_date']
+        indexes = [
+            models.Index(
+                fields=['-expiry_date', '-id'],
+                name='certificate_expiry_date',
+            ),
+        ]
         verbose_name = 'сертификат'
         verbose_name_plural = 'сертификаты'
 
@@ -252,9 +356,14 @@ class SupportApplication(models.Model):
     chat_id = models.PositiveBigIntegerField(
         'ID чата',
         null=False,
-        blank=False
+        blank=False,
+        db_index=True
+    )
+    tg_username = models.CharField(
+        'Ник в Telegram',
+        max_length=256,
+        db_index=True
     )
-    tg_username = models.CharField('Ник в Telegram', max_length=256)
     language = models.CharField(
         'Язык',
         max_length=2,
@@ -286,10 +395,41 @@ class SupportApplication(models.Model):
 
     class Meta:
         ordering = ['-registered_at']
+        indexes = [
+            models.Index(
+                fields=['-registered_at', '-id'],
+                name='support_application_registered',
+            ),
+            models.Index(
+                fields=['-registered_at'],
+                condition=models.Q(closed=False),
+                name='support_application_open',
+            ),
+            models.Index(
+                fields=['request_type'],
+                condition=models.Q(closed=False),
+                name='support_application_open_type',
+            ),
+        ]
         verbose_name = 'заявка на поддержку'
         verbose_name_plural = 'заявки на поддержку'
 
 
+class OpenSupportApplicationManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().filter(closed=False)
+
+
+class OpenSupportApplication(SupportApplication):
+    objects = OpenSupportApplicationManager()
+
+    class Meta:
+        proxy = True
+        ordering = ['-registered_at']
+        verbose_name = 'открытая заявка'
+        verbose_name_plural = 'очередь открытых заявок'
+
+
 class Faq(models.Model):
     number = models.PositiveIntegerField(r'№ п/п', unique=True)
     russian_question = models.CharField('Вопрос на русском', max_length=256)
@@ -302,3 +442,107 @@ class Faq(models.Model):
         ordering = ['number']
         verbose_name = 'FAQ'
         verbose_name_plural = 'FAQ'
+
+
+class Broadcast(models.Model):
+    created_at = models.DateTimeField('Создана', auto_now_add=True)
+    russian_text = models.TextField('Текст на русском')
+    english_text = models.TextField('Текст на английском', blank=True)
+    started_at = models.DateTimeField('Начата', null=True, blank=True)
+    finished_at = models.DateTimeField(
+        'Закончена',
+        null=True,
+        blank=True,
+        db_index=True,
+    )
+    last_chat_id = models.PositiveBigIntegerField(
+        'ID последнего чата в рассылке',
+        default=0
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'рассылка'
+        verbose_name_plural = 'рассылки'
+
+
+class BroadcastDelivery(models.Model):
+    PENDING = 'PE'
+    SENT = 'SE'
+    FAILED = 'FA'
+    UNCONFIRMED = 'UN'
+    STATUSES = [
+        (PENDING, 'Отправляется'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+        (UNCONFIRMED, 'Неизвестно, отправлено ли'),
+    ]
+
+    broadcast = models.ForeignKey(
+        Broadcast,
+        on_delete=models.CASCADE,
+        verbose_name='Рассылка',
+        related_name='deliveries',
+    )
+    chat_id = models.PositiveBigIntegerField('ID чата')
+    reserved_at = models.DateTimeField('Зарезервировано', auto_now_add=True)
+    status = models.CharField(
+        'Статус',
+        max_length=2,
+        choices=STATUSES,
+        default=PENDING,
+        db_index=True,
+    )
+    message_id = models.PositiveBigIntegerField(
+        'ID сообщения',
+        null=True,
+        blank=True
+    )
+    error = models.CharField('Ошибка', max_length=256, blank=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        ordering = ['broadcast', 'chat_id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['broadcast', 'chat_id'],
+                name='broadcast_delivery_chat',
+            ),
+        ]
+        verbose_name = 'отправка рассылки'
+        verbose_name_plural = 'отправки рассылки'
+
+
+class Outbox(models.Model):
+    created_at = models.DateTimeField('Создано', auto_now_add=True)
+    chat_id = models.BigIntegerField('ID чата')
+    text = models.TextField('Текст')
+    dedup_key = models.CharField(
+        'Ключ для защиты от повторов',
+        max_length=128,
+        null=True,
+        blank=True
+    )
+    processed_at = models.DateTimeField('Обработано', null=True, blank=True)
+    error = models.CharField('Ошибка', max_length=256, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(processed_at__isnull=True),
+                name='outbox_unprocessed',
+            ),
+        ]
+        # Only unsent messages are deduplicated, so the same key can be
+        # sent again later, e.g. when an order status is set once more.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedup_key'],
+                condition=models.Q(processed_at__isnull=True),
+                name='outbox_unprocessed_dedup_key',
+            ),
+        ]
+        verbose_name = 'исходящее сообщение'
+        verbose_name_plural = 'исходящие сообщения'
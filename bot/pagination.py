@@ -0,0 +1,145 @@
+import json
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+from django.utils.functional import cached_property
+
+CURSOR_VAR = 'after'
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator which doesn't count large querysets exactly.
+
+    On PostgreSQL the planner's estimate of the query rows is used
+    if it is above estimate_threshold. Smaller querysets and querysets
+    of other databases are counted with COUNT(*).
+    """
+
+    estimate_threshold = 10000
+
+    @cached_property
+    def estimate(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return 0
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    @cached_property
+    def estimated(self):
+        return self.estimate > self.estimate_threshold
+
+    @cached_property
+    def count(self):
+        if self.estimated:
+            return self.estimate
+        return super().count
+
+
+class KeysetChangeList(ChangeList):
+    """Change list which pages by the keyset of the default ordering.
+
+    The next page starts after the ordering field value and the primary
+    key of the last shown row, so the database doesn't skip the rows of
+    the previous pages. One row more than the page is read to know if
+    there is a next page. Columns sorted by the user are paged by
+    numbers.
+    """
+
+    def get_queryset(self, request, *args, **kwargs):
+        self.cursor = self.params.pop(CURSOR_VAR, None)
+        ordering = self.model_admin.keyset_ordering
+        self.keyset_field = ordering.lstrip('-')
+        self.keyset_lookup = 'lt' if ordering.startswith('-') else 'gt'
+        if ORDER_VAR in self.params:
+            self.keyset_field = None
+        return super().get_queryset(request, *args, **kwargs)
+
+    def get_keyset_filter(self):
+        field = self.lookup_opts.get_field(self.keyset_field)
+        pk_field = self.lookup_opts.pk
+        value, _, pk = self.cursor.rpartition('_')
+        try:
+            value = field.to_python(value)
+            pk = pk_field.to_python(pk)
+        except ValidationError as error:
+            raise IncorrectLookupParameters(error)
+
+        # The change list always orders the rows with equal values by -pk.
+        if self.keyset_lookup == 'gt':
+            return (
+                Q(**{f'{self.keyset_field}__gt': value}) |
+                Q(**{self.keyset_field: value, 'pk__lt': pk})
+            )
+
+        # A row comparison is served by an index on (field, pk).
+        connection = connections[self.queryset.db]
+        quote_name = connection.ops.quote_name
+        table = quote_name(self.lookup_opts.db_table)
+        return RawSQL(
+            f'({table}.{quote_name(field.column)}, '
+            f'{table}.{quote_name(pk_field.column)}) < (%s, %s)',
+            (
+                field.get_db_prep_value(value, connection),
+                pk_field.get_db_prep_value(pk, connection)
+            ),
+            output_field=BooleanField()
+        )
+
+    def get_results(self, request):
+        self.next_page_url = None
+        self.first_page_url = self.get_query_string(remove=[CURSOR_VAR])
+        if not self.keyset_field or self.show_all:
+            super().get_results(request)
+            return
+
+        paginator = self.model_admin.get_paginator(
+            request, self.queryset, self.list_per_page
+        )
+        self.paginator = paginator
+        self.result_count = paginator.count
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.can_show_all = self.result_count <= self.list_max_show_all
+        self.multi_page = self.result_count > self.list_per_page
+
+        # The count is of all the rows, the page starts after the cursor.
+        result_list = self.queryset
+        if self.cursor:
+            result_list = result_list.filter(self.get_keyset_filter())
+        result_list = list(result_list[:self.list_per_page + 1])
+        self.result_list = result_list[:self.list_per_page]
+        if len(result_list) <= self.list_per_page:
+            return
+
+        last_row = self.result_list[-1]
+        field = self.lookup_opts.get_field(self.keyset_field)
+        cursor = f'{field.value_to_string(last_row)}_{last_row.pk}'
+        self.next_page_url = self.get_query_string(
+            {CURSOR_VAR: cursor},
+            remove=[PAGE_VAR]
+        )
+
+
+class KeysetPaginationMixin:
+    """Page a ModelAdmin by keyset_ordering with estimated counts."""
+
+    keyset_ordering = '-id'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
@@ -2,17 +2,44 @@ from asgiref.sync import sync_to_async
 from copy import deepcopy
 from typing import Dict, Optional
 
+from django.db import transaction
+from django.utils import timezone
 from telegram.ext import BasePersistence, PersistenceInput
 from telegram.ext._utils.types import (
     BD,
-    CD,
     UD,
     CDCData,
     ConversationDict,
     ConversationKey
 )
 
-from .models import ChatData
+from bot_utilities.session import ChatSession
+
+from .models import ArchivedChatData, ChatData
+
+
+def restore_archived_chat(chat_id: int) -> Optional[ChatData]:
+    """Move the chat back from the archive if it has been archived."""
+    archived_chat = (
+        ArchivedChatData.objects.select_for_update()
+        .filter(chat_id=chat_id)
+        .first()
+    )
+    if not archived_chat:
+        return None
+
+    chat = ChatData.objects.create(
+        chat_id=chat_id,
+        next_state=archived_chat.next_state,
+        language=archived_chat.language,
+        data=archived_chat.get_data()
+    )
+    # start_at is set on creation, so the archived one is set separately.
+    ChatData.objects.filter(chat_id=chat_id).update(
+        start_at=archived_chat.start_at
+    )
+    archived_chat.delete()
+    return chat
 
 
 class DjangoPersistence(BasePersistence):
@@ -25,20 +52,34 @@ class DjangoPersistence(BasePersistence):
             callback_data=False
         )
         super().__init__(store_data=store_data, update_interval=1)
-        self.chat_data: Optional[Dict[int, CD]] = None
+        self.chat_data: Optional[Dict[int, ChatSession]] = None
 
     @sync_to_async
-    def get_chat_data(self) -> Dict[int, CD]:
+    def get_chat_data(self) -> Dict[int, ChatSession]:
         """Return the chat_data from the Database if it exists or
            an empty :obj:`dict`.
 
         Returns:
-            Dict[:obj:`int`, :obj:`dict`]: The restored chat data.
+            Dict[:obj:`int`, :obj:`ChatSession`]: The restored chat data.
         """
         if not self.chat_data:
-            self.chat_data = {
-                data.chat_id: data.data for data in ChatData.objects.all()
-            }
+            self.chat_data = {}
+            outdated_chats = []
+            # Dropped chats are read on their next updates.
+            for chat in ChatData.objects.filter(dropped_at__isnull=True):
+                session = ChatSession.from_json(chat.data)
+                self.chat_data[chat.chat_id] = session
+                # Chats saved before the columns were filled in.
+                columns = (session.next_state, session.language_id)
+                if (chat.next_state, chat.language) != columns:
+                    chat.next_state = session.next_state
+                    chat.language = session.language_id
+                    outdated_chats.append(chat)
+            ChatData.objects.bulk_update(
+                outdated_chats,
+                ['next_state', 'language'],
+                batch_size=500
+            )
         return deepcopy(self.chat_data)
 
     @sync_to_async
@@ -58,14 +99,14 @@ class DjangoPersistence(BasePersistence):
         pass
 
     @sync_to_async
-    def update_chat_data(self, chat_id: int, data: CD) -> None:
+    def update_chat_data(self, chat_id: int, data: ChatSession) -> None:
         """Update the chat_data and save them in Database.
 
         Args:
             chat_id (:obj:`int`): The chat the data might have been
                                   changed for.
-            data (:obj:`dict`): The :attr:`telegram.ext.Application.chat_data`
-                                           ``[chat_id]``.
+            data (:obj:`ChatSession`): The
+                :attr:`telegram.ext.Application.chat_data` ``[chat_id]``.
         """
         if self.chat_data is None:
             self.chat_data = {}
@@ -73,10 +114,15 @@ class DjangoPersistence(BasePersistence):
         if self.chat_data.get(chat_id) == data:
             return
 
-        self.chat_data[chat_id] = data
+        self.chat_data[chat_id] = deepcopy(data)
         ChatData.objects.update_or_create(
             chat_id=chat_id,
-            defaults={'data': data}
+            defaults={
+                'data': data.to_json(),
+                'next_state': data.next_state,
+                'language': data.language_id,
+                'dropped_at': None
+            }
         )
 
     @sync_to_async
@@ -103,20 +149,20 @@ class DjangoPersistence(BasePersistence):
     @sync_to_async
     def drop_chat_data(self, chat_id: int) -> None:
         """Delete the specified key from the ``chat_data`` and
-        save them in Database.
+        mark the chat as dropped in Database.
+
+        The chat row keeps its data, which is read again by
+        refresh_chat_data on the next update of the chat.
 
         .. versionadded:: 20.0
 
         Args:
             chat_id (:obj:`int`): The chat id to delete from the persistence.
         """
-        if self.chat_data is None:
-            return
-
-        self.chat_data.pop(chat_id, None)
-        ChatData.objects.update_or_create(
-            chat_id=chat_id,
-            defaults={'data': None}
+        if self.chat_data is not None:
+            self.chat_data.pop(chat_id, None)
+        ChatData.objects.filter(chat_id=chat_id).update(
+            dropped_at=timezone.now()
         )
 
     @sync_to_async
@@ -124,12 +170,33 @@ class DjangoPersistence(BasePersistence):
         pass
 
     @sync_to_async
-    def refresh_chat_data(self, chat_id: int, chat_data: CD) -> None:
-        """Do nothing.
+    def refresh_chat_data(self, chat_id: int, chat_data: ChatSession) -> None:
+        """Read the chat_data of a chat dropped from memory from Database.
+
+        Chats already in memory aren't read again, so the Database is
+        queried only on the first update after the chat was dropped.
+        Archived chats are moved back from the archive.
 
         .. versionadded:: 13.6
         .. seealso:: :meth:`telegram.ext.BasePersistence.refresh_user_data`
         """
+        if self.chat_data is None:
+            self.chat_data = {}
+
+        if chat_id in self.chat_data:
+            return
+
+        with transaction.atomic():
+            # Waits for archive_chats if it is archiving the chat, then
+            # the chat is read from the archive.
+            ChatData.objects.filter(chat_id=chat_id).update(dropped_at=None)
+            chat = (
+                ChatData.objects.filter(chat_id=chat_id).first()
+                or restore_archived_chat(chat_id)
+            )
+            if chat:
+                chat_data.load(ChatSession.from_json(chat.data))
+        self.chat_data[chat_id] = deepcopy(chat_data)
 
     @sync_to_async
     def refresh_bot_data(self, bot_data: BD) -> None:
@@ -139,5 +206,5 @@ class DjangoPersistence(BasePersistence):
     def refresh_user_data(self, user_id: int, user_data: UD) -> None:
         pass
 
-    def flush(self) -> None:
+    async def flush(self) -> None:
         pass
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.db.models import Q
+
+MAX_BIG_INTEGER = 2 ** 63 - 1
+
+
+class IndexedSearchMixin:
+    """Search a ModelAdmin only with lookups served by indexes.
+
+    A number is compared with search_number_fields exactly and with
+    search_phone_fields as the beginning of a phone number. Text is
+    matched from the beginning of search_prefix_fields. Names in
+    search_trigram_fields are matched from the beginning too and, with
+    ADMIN_TRIGRAM_SEARCH on PostgreSQL, by trigram similarity.
+    """
+
+    search_number_fields = ()
+    search_phone_fields = ()
+    search_prefix_fields = ()
+    search_trigram_fields = ()
+
+    def get_search_fields(self, request):
+        return (
+            *self.search_number_fields,
+            *self.search_phone_fields,
+            *self.search_prefix_fields,
+            *self.search_trigram_fields
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+
+        query = Q()
+        number = search_term.lstrip('+')
+        for symbol in ' -()':
+            number = number.replace(symbol, '')
+        if number.isascii() and number.isdigit():
+            if int(number) <= MAX_BIG_INTEGER:
+                for field in self.search_number_fields:
+                    query |= Q(**{field: int(number)})
+            for field in self.search_phone_fields:
+                query |= Q(**{f'{field}__startswith': f'+{number}'})
+
+        for field in self.search_prefix_fields + self.search_trigram_fields:
+            query |= Q(**{f'{field}__startswith': search_term})
+        if settings.ADMIN_TRIGRAM_SEARCH:
+            for field in self.search_trigram_fields:
+                query |= Q(**{f'{field}__trigram_similar': search_term})
+
+        if not query:
+            return queryset.none(), False
+        return queryset.filter(query), False
@@ -0,0 +1,169 @@
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import telegram.error
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from django.utils import timezone
+
+from bot.choices import LANGUAGE_NUMBERS
+from bot.database import Database
+from bot.models import Broadcast, BroadcastDelivery, ChatData
+from bot_utilities import jobs
+
+
+def create_chats(*chats_ids, language='russian'):
+    ChatData.objects.bulk_create(
+        ChatData(
+            chat_id=chat_id,
+            language=LANGUAGE_NUMBERS[language],
+            data={}
+        )
+        for chat_id in chats_ids
+    )
+
+
+@sync_to_async
+def get_statuses(broadcast):
+    return dict(
+        broadcast.deliveries.order_by('chat_id')
+        .values_list('chat_id', 'status')
+    )
+
+
+class BroadcastBatchTest(TestCase):
+    def setUp(self):
+        create_chats(10, 20, 30)
+        create_chats(40, language='english')
+        self.broadcast = Broadcast.objects.create(
+            russian_text='Привет',
+            english_text='Hello'
+        )
+
+    async def test_batches_go_on_from_the_last_chat(self):
+        first_batch = await Database.get_broadcast_batch(2)
+        second_batch = await Database.get_broadcast_batch(2)
+        last_batch = await Database.get_broadcast_batch(2)
+
+        self.assertEqual(first_batch, {
+            'broadcast_id': self.broadcast.id,
+            'messages': [(10, 'Привет'), (20, 'Привет')],
+        })
+        self.assertEqual(
+            second_batch['messages'],
+            [(30, 'Привет'), (40, 'Hello')]
+        )
+        self.assertEqual(last_batch['messages'], [])
+        self.assertIsNone(await Database.get_broadcast_batch(2))
+
+        await self.broadcast.arefresh_from_db()
+        self.assertEqual(self.broadcast.last_chat_id, 40)
+        self.assertIsNotNone(self.broadcast.finished_at)
+
+    async def test_chats_are_reserved_before_sending(self):
+        await Database.get_broadcast_batch(3)
+
+        self.assertEqual(
+            await get_statuses(self.broadcast),
+            dict.fromkeys([10, 20, 30], BroadcastDelivery.PENDING)
+        )
+
+    async def test_english_text_falls_back_to_russian(self):
+        self.broadcast.english_text = ''
+        await self.broadcast.asave()
+
+        batch = await Database.get_broadcast_batch(4)
+
+        self.assertEqual(batch['messages'][-1], (40, 'Привет'))
+
+    async def test_oldest_broadcast_goes_first(self):
+        await Broadcast.objects.acreate(russian_text='Пока')
+
+        batch = await Database.get_broadcast_batch(1)
+
+        self.assertEqual(batch['broadcast_id'], self.broadcast.id)
+
+    async def test_results_are_saved(self):
+        await Database.get_broadcast_batch(2)
+
+        await Database.save_broadcast_deliveries(
+            self.broadcast.id,
+            [(10, 100, ''), (20, None, 'Forbidden: bot was blocked')]
+        )
+
+        self.assertEqual(await get_statuses(self.broadcast), {
+            10: BroadcastDelivery.SENT,
+            20: BroadcastDelivery.FAILED,
+        })
+
+    async def test_stale_pending_deliveries_are_unconfirmed(self):
+        await Database.get_broadcast_batch(3)
+        await BroadcastDelivery.objects.filter(chat_id=10).aupdate(
+            reserved_at=timezone.now() - timedelta(hours=2)
+        )
+        await Database.save_broadcast_deliveries(
+            self.broadcast.id,
+            [(20, 100, '')]
+        )
+
+        stale_count = await Database.mark_stale_broadcast_deliveries(
+            timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(stale_count, 1)
+        self.assertEqual(await get_statuses(self.broadcast), {
+            10: BroadcastDelivery.UNCONFIRMED,
+            20: BroadcastDelivery.SENT,
+            30: BroadcastDelivery.PENDING,
+        })
+
+
+class SendBroadcastsTest(TestCase):
+    def setUp(self):
+        create_chats(10, 20, 30)
+        self.broadcast = Broadcast.objects.create(russian_text='Привет')
+        self.bot = mock.AsyncMock()
+        self.bot.send_message.side_effect = self.send_message
+        self.context = SimpleNamespace(bot=self.bot)
+
+    async def send_message(self, chat_id, text, rate_limit_args):
+        if chat_id == 20:
+            raise telegram.error.Forbidden('bot was blocked by the user')
+        return SimpleNamespace(message_id=chat_id * 10)
+
+    def get_sent_chats(self):
+        return [
+            call.kwargs['chat_id']
+            for call in self.bot.send_message.await_args_list
+        ]
+
+    async def test_every_chat_gets_the_broadcast_once(self):
+        with mock.patch.object(jobs, 'BROADCAST_BATCH_SIZE', 2):
+            await jobs.send_broadcasts(self.context)
+            await jobs.send_broadcasts(self.context)
+
+        self.assertEqual(self.get_sent_chats(), [10, 20, 30])
+        self.assertEqual(await get_statuses(self.broadcast), {
+            10: BroadcastDelivery.SENT,
+            20: BroadcastDelivery.FAILED,
+            30: BroadcastDelivery.SENT,
+        })
+
+    async def test_interrupted_batch_is_not_sent_again(self):
+        await Database.get_broadcast_batch(2)
+        await BroadcastDelivery.objects.aupdate(
+            reserved_at=timezone.now() - timedelta(
+                seconds=jobs.BROADCAST_PENDING_TIMEOUT + 1
+            )
+        )
+
+        with self.assertLogs(jobs.logger, 'WARNING'):
+            await jobs.send_broadcasts(self.context)
+
+        self.assertEqual(self.get_sent_chats(), [30])
+        self.assertEqual(await get_statuses(self.broadcast), {
+            10: BroadcastDelivery.UNCONFIRMED,
+            20: BroadcastDelivery.UNCONFIRMED,
+            30: BroadcastDelivery.SENT,
+        })
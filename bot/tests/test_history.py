@@ -0,0 +1,120 @@
+import asyncio
+from unittest import mock
+
+import telegram.error
+from django.test import SimpleTestCase
+
+from bot_utilities import history
+from bot_utilities.history import MessagesHistory, delete_messages
+
+CHAT_ID = 10
+
+
+class MessagesHistoryTest(SimpleTestCase):
+    def test_consecutive_ids_are_kept_as_ranges(self):
+        history = MessagesHistory([1, 2, 3, 5, 6, 9])
+
+        self.assertEqual(history.to_json(), [[1, 3], [5, 6], [9, 9]])
+        self.assertEqual(list(history), [1, 2, 3, 5, 6, 9])
+        self.assertEqual(len(history), 6)
+        self.assertEqual((history.first, history.last), (1, 9))
+
+    def test_last_id_is_not_repeated(self):
+        history = MessagesHistory([1, 2])
+        history.append(2)
+
+        self.assertEqual(list(history), [1, 2])
+
+    def test_oldest_ids_are_dropped(self):
+        history = MessagesHistory([1, 2, 3, 7, 8], max_length=3)
+
+        self.assertEqual(history.to_json(), [[3, 3], [7, 8]])
+        self.assertEqual(len(history), 3)
+
+    def test_remove(self):
+        history = MessagesHistory([1, 2, 3, 4, 5])
+        history.remove([2, 5])
+
+        self.assertEqual(history.to_json(), [[1, 1], [3, 4]])
+        self.assertEqual(len(history), 3)
+
+    def test_json_round_trip(self):
+        history = MessagesHistory([1, 2, 3, 5])
+
+        self.assertEqual(MessagesHistory.from_json(history.to_json()), history)
+
+    def test_from_list_of_ids(self):
+        history = MessagesHistory.from_json([4, 5, 6, 10])
+
+        self.assertEqual(history.to_json(), [[4, 6], [10, 10]])
+
+    def test_empty(self):
+        history = MessagesHistory.from_json(None)
+
+        self.assertEqual(len(history), 0)
+        self.assertIsNone(history.first)
+        self.assertIsNone(history.last)
+
+
+class DeleteMessagesTest(SimpleTestCase):
+    def setUp(self):
+        self.bot = mock.AsyncMock()
+
+    async def test_chunks_of_allowed_size(self):
+        message_ids = list(range(1, 251))
+
+        deleted_ids = await delete_messages(self.bot, CHAT_ID, message_ids)
+
+        self.assertEqual(deleted_ids, message_ids)
+        self.assertEqual(
+            [
+                len(call.args[1])
+                for call in self.bot.delete_messages.await_args_list
+            ],
+            [100, 100, 50]
+        )
+
+    async def test_refused_chunk_is_deleted_one_by_one(self):
+        self.bot.delete_messages.side_effect = telegram.error.BadRequest(
+            'Message to delete not found'
+        )
+        self.bot.delete_message.side_effect = [
+            None,
+            telegram.error.BadRequest('Message to delete not found'),
+            telegram.error.NetworkError('connection reset'),
+        ]
+
+        deleted_ids = await delete_messages(self.bot, CHAT_ID, [1, 2, 3])
+
+        self.assertEqual(deleted_ids, [1, 2])
+
+    async def test_failed_chunk_is_postponed(self):
+        self.bot.delete_messages.side_effect = telegram.error.NetworkError(
+            'connection reset'
+        )
+
+        deleted_ids = await delete_messages(self.bot, CHAT_ID, [1, 2, 3])
+
+        self.assertEqual(deleted_ids, [])
+        self.bot.delete_message.assert_not_awaited()
+
+    async def test_concurrent_requests_are_bounded(self):
+        running = 0
+        max_running = 0
+
+        async def delete_chunk(chat_id, message_ids):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0)
+            running -= 1
+
+        self.bot.delete_messages.side_effect = delete_chunk
+
+        await delete_messages(self.bot, CHAT_ID, list(range(1, 1001)))
+
+        self.assertEqual(self.bot.delete_messages.await_count, 10)
+        self.assertEqual(
+            max_running,
+            history.MAX_CONCURRENT_DELETION_REQUESTS
+        )
@@ -0,0 +1,141 @@
+import asyncio
+from unittest import mock
+
+from django.test import SimpleTestCase
+from telegram.error import RetryAfter
+
+from bot_utilities import outbound
+from bot_utilities.outbound import (
+    BULK_PRIORITY, OutboundScheduler, TokenBucket, USER_REPLY_PRIORITY
+)
+
+yield_control = asyncio.sleep
+
+
+class FakeClock:
+    """Stand in for time.monotonic and asyncio.sleep of the scheduler."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.now += delay
+        await yield_control(0)
+
+
+class FakeClockMixin:
+    def setUp(self):
+        super().setUp()
+        self.clock = FakeClock()
+        for name, target, fake in (
+            ('monotonic', outbound.time, self.clock.monotonic),
+            ('sleep', outbound.asyncio, self.clock.sleep),
+        ):
+            patcher = mock.patch.object(target, name, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TokenBucketTest(FakeClockMixin, SimpleTestCase):
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=2, capacity=3)
+        for _ in range(3):
+            self.assertEqual(bucket.get_delay(), 0)
+            bucket.consume()
+        self.assertEqual(bucket.get_delay(), 0.5)
+
+        self.clock.now += 0.5
+        self.assertEqual(bucket.get_delay(), 0)
+
+    def test_refill_is_capped(self):
+        bucket = TokenBucket(rate=2, capacity=3)
+        bucket.consume()
+        self.clock.now += 60
+        bucket.get_delay()
+        self.assertEqual(bucket.tokens, 3)
+
+
+class OutboundSchedulerTest(FakeClockMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sent = []
+
+    async def send(self, scheduler, chat_id, endpoint='sendMessage',
+                   priority=None):
+        async def callback():
+            self.sent.append((chat_id, endpoint, self.clock.now))
+            return True
+
+        return await scheduler.process_request(
+            callback, (), {}, endpoint, {'chat_id': chat_id}, priority
+        )
+
+    async def test_chat_bucket_spreads_requests(self):
+        scheduler = OutboundScheduler(chat_rate=1, chat_capacity=2)
+        for _ in range(4):
+            await self.send(scheduler, 10)
+
+        sent_at = [sent_at - 1000 for _, _, sent_at in self.sent]
+        self.assertEqual(sent_at, [0, 0, 1, 2])
+
+    async def test_private_deletions_skip_chat_bucket(self):
+        scheduler = OutboundScheduler(chat_rate=1, chat_capacity=1)
+        await self.send(scheduler, 10)
+        await self.send(scheduler, 10, 'deleteMessage')
+        await self.send(scheduler, 10, 'editMessageText')
+
+        self.assertEqual({sent_at for _, _, sent_at in self.sent}, {1000})
+
+    async def test_user_replies_go_before_bulk_sending(self):
+        scheduler = OutboundScheduler(chat_rate=1, chat_capacity=1)
+        await self.send(scheduler, 10)
+        await asyncio.gather(
+            self.send(scheduler, 10, 'sendPhoto', BULK_PRIORITY),
+            self.send(scheduler, 10, 'sendMessage', USER_REPLY_PRIORITY),
+        )
+
+        endpoints = [endpoint for _, endpoint, _ in self.sent]
+        self.assertEqual(
+            endpoints,
+            ['sendMessage', 'sendMessage', 'sendPhoto']
+        )
+
+    async def test_retry_after_pauses_requests(self):
+        scheduler = OutboundScheduler(max_retries=1)
+        attempts = []
+
+        async def callback():
+            attempts.append(self.clock.now)
+            if len(attempts) == 1:
+                raise RetryAfter(5)
+            return True
+
+        result = await scheduler.process_request(
+            callback, (), {}, 'sendMessage', {'chat_id': 10}, None
+        )
+
+        self.assertIs(result, True)
+        self.assertEqual(attempts, [1000, 1005])
+
+    async def test_retry_after_gives_up(self):
+        scheduler = OutboundScheduler(max_retries=1)
+        callback = mock.AsyncMock(side_effect=RetryAfter(5))
+
+        with self.assertRaises(RetryAfter):
+            await scheduler.process_request(
+                callback, (), {}, 'sendMessage', {'chat_id': 10}, None
+            )
+        self.assertEqual(callback.await_count, 2)
+
+    async def test_least_recently_used_bucket_is_dropped(self):
+        scheduler = OutboundScheduler()
+        with mock.patch.object(outbound, 'MAX_CHAT_BUCKETS', 2):
+            await self.send(scheduler, 10)
+            await self.send(scheduler, 20)
+            await self.send(scheduler, 10)
+            await self.send(scheduler, 30)
+
+        self.assertEqual(list(scheduler._chat_buckets), [10, 30])
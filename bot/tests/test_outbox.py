@@ -0,0 +1,135 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import telegram.error
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, TestCase, override_settings
+from telegram.constants import MessageLimit
+
+from bot.database import Database
+from bot.models import Outbox, SupportApplication
+from bot_utilities import jobs
+from bot_utilities.jobs import DIGEST_SEPARATOR, get_outbox_digests
+
+OPERATOR_CHAT_ID = -100
+
+
+@sync_to_async
+def get_processed_messages():
+    return dict(
+        Outbox.objects.filter(processed_at__isnull=False)
+        .values_list('text', 'error')
+    )
+
+
+class OutboxDigestsTest(SimpleTestCase):
+    def test_messages_to_one_chat_are_joined(self):
+        digests = get_outbox_digests([
+            {'id': 1, 'chat_id': 10, 'text': 'first'},
+            {'id': 2, 'chat_id': 20, 'text': 'other chat'},
+            {'id': 3, 'chat_id': 10, 'text': 'second'},
+        ])
+
+        self.assertEqual(digests, [
+            (10, [1, 3], f'first{DIGEST_SEPARATOR}second'),
+            (20, [2], 'other chat'),
+        ])
+
+    def test_digests_fit_into_a_message(self):
+        text = 'a' * (MessageLimit.MAX_TEXT_LENGTH // 2)
+
+        digests = get_outbox_digests([
+            {'id': message_id, 'chat_id': 10, 'text': text}
+            for message_id in (1, 2, 3)
+        ])
+
+        self.assertEqual(
+            [messages_ids for _, messages_ids, _ in digests],
+            [[1], [2], [3]]
+        )
+
+    def test_long_message_is_cut(self):
+        text = 'a' * (MessageLimit.MAX_TEXT_LENGTH + 1)
+
+        digests = get_outbox_digests([{'id': 1, 'chat_id': 10, 'text': text}])
+
+        self.assertEqual(len(digests[0][2]), MessageLimit.MAX_TEXT_LENGTH)
+
+
+class SupportApplicationNoticeTest(TestCase):
+    async def create_application(self):
+        await Database.create_support_application(
+            chat_id=10,
+            tg_username='customer',
+            language='russian',
+            request_type='activation_problem'
+        )
+
+    @override_settings(TELEGRAM_OPERATOR_CHAT_ID=OPERATOR_CHAT_ID)
+    async def test_operators_are_notified(self):
+        await self.create_application()
+
+        application = await SupportApplication.objects.aget()
+        message = await Outbox.objects.aget()
+        self.assertEqual(message.chat_id, OPERATOR_CHAT_ID)
+        self.assertIn(f'№{application.id}', message.text)
+        self.assertIn('@customer', message.text)
+
+    @override_settings(TELEGRAM_OPERATOR_CHAT_ID=None)
+    async def test_no_operator_chat(self):
+        await self.create_application()
+
+        self.assertEqual(await SupportApplication.objects.acount(), 1)
+        self.assertFalse(await Outbox.objects.aexists())
+
+
+class SendOutboxMessagesTest(TestCase):
+    def setUp(self):
+        Outbox.objects.bulk_create([
+            Outbox(chat_id=10, text='first'),
+            Outbox(chat_id=10, text='second'),
+            Outbox(chat_id=20, text='blocked'),
+            Outbox(chat_id=30, text='offline'),
+        ])
+        self.bot = mock.AsyncMock()
+        self.bot.send_message.side_effect = self.send_message
+        self.context = SimpleNamespace(bot=self.bot)
+
+    async def send_message(self, chat_id, text, rate_limit_args):
+        if chat_id == 20:
+            raise telegram.error.Forbidden('bot was blocked by the user')
+        if chat_id == 30:
+            raise telegram.error.NetworkError('connection reset')
+        return SimpleNamespace(message_id=1)
+
+    async def test_messages_are_processed(self):
+        with self.assertLogs(jobs.logger, 'ERROR'):
+            await jobs.send_outbox_messages(self.context)
+
+        self.bot.send_message.assert_any_await(
+            chat_id=10,
+            text=f'first{DIGEST_SEPARATOR}second',
+            rate_limit_args=jobs.BULK_PRIORITY
+        )
+        self.assertEqual(await get_processed_messages(), {
+            'first': '',
+            'second': '',
+            'blocked': 'bot was blocked by the user',
+        })
+
+    async def test_network_errors_are_retried(self):
+        with self.assertLogs(jobs.logger, 'ERROR'):
+            await jobs.send_outbox_messages(self.context)
+        self.bot.send_message.side_effect = None
+        self.bot.send_message.return_value = SimpleNamespace(message_id=1)
+
+        await jobs.send_outbox_messages(self.context)
+
+        self.bot.send_message.assert_awaited_with(
+            chat_id=30,
+            text='offline',
+            rate_limit_args=jobs.BULK_PRIORITY
+        )
+        self.assertEqual(await Outbox.objects.filter(
+            processed_at__isnull=True
+        ).acount(), 0)
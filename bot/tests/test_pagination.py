@@ -0,0 +1,91 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.admin import site
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from bot.choices import MAIN_MENU, START
+from bot.models import ChatData
+from bot.pagination import CURSOR_VAR
+
+PAGE_SIZE = 3
+
+
+class KeysetChangeListTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin')
+        ChatData.objects.bulk_create(
+            ChatData(chat_id=chat_id, next_state=START, data={})
+            for chat_id in range(1, 9)
+        )
+        # Pairs of chats called at the same time, to check that no row
+        # is lost or repeated on ties.
+        now = timezone.now()
+        for chat_id in range(1, 9):
+            ChatData.objects.filter(chat_id=chat_id).update(
+                called_at=now - timedelta(minutes=(chat_id + 1) // 2),
+                next_state=MAIN_MENU if chat_id % 3 else START
+            )
+
+    def setUp(self):
+        self.model_admin = site._registry[ChatData]
+        patcher = mock.patch.object(
+            self.model_admin,
+            'list_per_page',
+            PAGE_SIZE
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_changelist(self, query_string=''):
+        request = RequestFactory().get(f'/admin/bot/chatdata/{query_string}')
+        request.user = self.user
+        return self.model_admin.get_changelist_instance(request)
+
+    def get_pages(self, query_string='?'):
+        pages = []
+        while query_string:
+            changelist = self.get_changelist(query_string)
+            pages.append([chat.chat_id for chat in changelist.result_list])
+            query_string = changelist.next_page_url
+        return pages
+
+    def test_pages_follow_the_ordering(self):
+        expected_ids = list(
+            ChatData.objects.order_by('-called_at', '-chat_id')
+            .values_list('chat_id', flat=True)
+        )
+
+        pages = self.get_pages()
+
+        self.assertEqual(pages, [[2, 1, 4], [3, 6, 5], [8, 7]])
+        self.assertEqual(sum(pages, []), expected_ids)
+
+    def test_pages_keep_the_filters(self):
+        pages = self.get_pages(f'?next_state__exact={MAIN_MENU}')
+
+        self.assertEqual(pages, [[2, 1, 4], [5, 8, 7]])
+
+    def test_count_is_of_all_the_rows(self):
+        changelist = self.get_changelist()
+        next_changelist = self.get_changelist(changelist.next_page_url)
+
+        self.assertEqual(next_changelist.result_count, 8)
+        self.assertTrue(next_changelist.multi_page)
+
+    def test_sorted_column_is_paged_by_numbers(self):
+        changelist = self.get_changelist('?o=0&p=2')
+
+        self.assertIsNone(changelist.next_page_url)
+        self.assertEqual(
+            [chat.chat_id for chat in changelist.result_list],
+            [4, 5, 6]
+        )
+
+    def test_broken_cursor(self):
+        with self.assertRaises(IncorrectLookupParameters):
+            self.get_changelist(f'?{CURSOR_VAR}=yesterday_1')
@@ -0,0 +1,288 @@
+from django.test import SimpleTestCase
+
+from bot_utilities import handlers
+from bot_utilities.states import (
+    START, SELECTING_LANGUAGE, MAIN_MENU, SELECTING_IMPRESSIONS_CATEGORY,
+    SELECTING_IMPRESSION, SELECTING_RECEIVING_METHOD, WAITING_CUSTOMER_EMAIL,
+    ACQUAINTED_PRIVACY_POLICY, WAITING_CUSTOMER_FULLNAME,
+    WAITING_CUSTOMER_PHONE, WAITING_CUSTOMER_CONFIRMATION,
+    WAITING_PAYMENT_SCREENSHOT, DIALOGUE_END, SELECTING_DELIVERY_METHOD,
+    WAITING_RECIPIENT_NAME, WAITING_RECIPIENT_CONTACT,
+    WAITING_RECIPIENT_CONFIRMATION, CONFIRMING_SELF_DELIVERY,
+    WAITING_CERTIFICATE_ID, WRONG_CERTIFICATE_MENU, SELECTING_QUESTION
+)
+from bot_utilities.transitions import (
+    ANY, CALLBACK, MESSAGE, compile_transitions, get_all_states,
+    resolve_handler
+)
+
+# The branches of the if-chains that dispatched updates before the
+# transitions table: state, input kind, callback data and the handler
+# doing what the branch did.
+OLD_DISPATCH = [
+    (START, MESSAGE, ANY, handlers.handle_start_command),
+    (START, CALLBACK, 'main_menu', handlers.handle_start_command),
+    (SELECTING_LANGUAGE, MESSAGE, ANY, handlers.handle_start_command),
+    (SELECTING_LANGUAGE, CALLBACK, 'russian', handlers.handle_language_button),
+    (SELECTING_LANGUAGE, CALLBACK, 'english', handlers.handle_language_button),
+    (MAIN_MENU, MESSAGE, ANY, handlers.handle_unrecognized_main_menu_item),
+    (
+        MAIN_MENU, CALLBACK, 'impression',
+        handlers.send_impressions_categories_menu
+    ),
+    (MAIN_MENU, CALLBACK, 'certificate', handlers.handle_certificate_button),
+    (MAIN_MENU, CALLBACK, 'faq', handlers.send_faq_menu),
+    (
+        SELECTING_IMPRESSIONS_CATEGORY, MESSAGE, ANY,
+        handlers.handle_unrecognized_impressions_category
+    ),
+    (
+        SELECTING_IMPRESSIONS_CATEGORY, CALLBACK, 'main_menu',
+        handlers.send_main_menu
+    ),
+    *[
+        (
+            SELECTING_IMPRESSIONS_CATEGORY, CALLBACK, category,
+            handlers.handle_impressions_category_button
+        )
+        for category in ('man', 'girl', 'couple', 'all')
+    ],
+    (
+        SELECTING_IMPRESSIONS_CATEGORY, CALLBACK, 'unknown_category',
+        handlers.handle_unrecognized_impressions_category
+    ),
+    (
+        SELECTING_IMPRESSION, MESSAGE, ANY,
+        handlers.handle_impression_number_message
+    ),
+    (
+        SELECTING_IMPRESSION, CALLBACK, 'category_menu',
+        handlers.send_impressions_categories_menu
+    ),
+    (
+        SELECTING_IMPRESSION, CALLBACK, 'impressions_next_page',
+        handlers.handle_impressions_page_button
+    ),
+    (
+        SELECTING_IMPRESSION, CALLBACK, 'impressions_previous_page',
+        handlers.handle_impressions_page_button
+    ),
+    (
+        SELECTING_IMPRESSION, CALLBACK, 'unknown_impression',
+        handlers.handle_unrecognized_impression
+    ),
+    (
+        SELECTING_RECEIVING_METHOD, MESSAGE, ANY,
+        handlers.handle_unrecognized_receiving_method
+    ),
+    (
+        SELECTING_RECEIVING_METHOD, CALLBACK, 'main_menu',
+        handlers.send_main_menu
+    ),
+    (
+        SELECTING_RECEIVING_METHOD, CALLBACK, 'impression',
+        handlers.send_impressions_categories_menu
+    ),
+    (
+        SELECTING_RECEIVING_METHOD, CALLBACK, 'email',
+        handlers.handle_email_button
+    ),
+    (
+        SELECTING_RECEIVING_METHOD, CALLBACK, 'gift_box',
+        handlers.handle_giftbox_button
+    ),
+    (
+        WAITING_CUSTOMER_EMAIL, MESSAGE, ANY,
+        handlers.handle_customer_email_message
+    ),
+    (
+        ACQUAINTED_PRIVACY_POLICY, MESSAGE, ANY,
+        handlers.send_privacy_policy_menu
+    ),
+    (
+        ACQUAINTED_PRIVACY_POLICY, CALLBACK, 'privacy_policy',
+        handlers.handle_privacy_policy_button
+    ),
+    (
+        WAITING_CUSTOMER_FULLNAME, MESSAGE, ANY,
+        handlers.handle_customer_fullname_message
+    ),
+    (
+        WAITING_CUSTOMER_PHONE, MESSAGE, ANY,
+        handlers.handle_customer_phone_message
+    ),
+    (
+        WAITING_CUSTOMER_CONFIRMATION, MESSAGE, ANY,
+        handlers.handle_unrecognized_customer_confirmation
+    ),
+    (
+        WAITING_CUSTOMER_CONFIRMATION, CALLBACK, 'right_customer',
+        handlers.handle_right_customer_button
+    ),
+    (
+        WAITING_CUSTOMER_CONFIRMATION, CALLBACK, 'wrong_customer',
+        handlers.handle_wrong_customer_button
+    ),
+    (
+        WAITING_PAYMENT_SCREENSHOT, MESSAGE, ANY,
+        handlers.handle_payment_screenshot
+    ),
+    (DIALOGUE_END, MESSAGE, ANY, handlers.handle_dialogue_end),
+    (
+        DIALOGUE_END, CALLBACK, 'main_menu',
+        handlers.handle_back_to_main_menu_button
+    ),
+    (
+        SELECTING_DELIVERY_METHOD, MESSAGE, ANY,
+        handlers.handle_unrecognized_delivery_method
+    ),
+    (
+        SELECTING_DELIVERY_METHOD, CALLBACK, 'courier_delivery',
+        handlers.handle_courier_delivery_button
+    ),
+    (
+        SELECTING_DELIVERY_METHOD, CALLBACK, 'self_delivery',
+        handlers.handle_self_delivery_button
+    ),
+    (
+        WAITING_RECIPIENT_NAME, MESSAGE, ANY,
+        handlers.handle_recipient_name_message
+    ),
+    (
+        WAITING_RECIPIENT_CONTACT, MESSAGE, ANY,
+        handlers.handle_recipient_contact_message
+    ),
+    (
+        WAITING_RECIPIENT_CONFIRMATION, MESSAGE, ANY,
+        handlers.handle_unrecognized_recipient_confirmation
+    ),
+    (
+        WAITING_RECIPIENT_CONFIRMATION, CALLBACK, 'right_recipient',
+        handlers.handle_right_recipient_button
+    ),
+    (
+        WAITING_RECIPIENT_CONFIRMATION, CALLBACK, 'wrong_recipient',
+        handlers.handle_wrong_recipient_button
+    ),
+    (
+        CONFIRMING_SELF_DELIVERY, MESSAGE, ANY,
+        handlers.handle_unrecognized_self_delivery_answer
+    ),
+    (
+        CONFIRMING_SELF_DELIVERY, CALLBACK, 'self_delivery_yes',
+        handlers.send_successful_booking_menu
+    ),
+    (
+        CONFIRMING_SELF_DELIVERY, CALLBACK, 'self_delivery_no',
+        handlers.send_delivery_methods_menu
+    ),
+    (
+        WAITING_CERTIFICATE_ID, MESSAGE, ANY,
+        handlers.handle_certificate_id_message
+    ),
+    (
+        WRONG_CERTIFICATE_MENU, MESSAGE, ANY,
+        handlers.handle_unrecognized_wrong_certificate_answer
+    ),
+    (
+        WRONG_CERTIFICATE_MENU, CALLBACK, 'certificate_id',
+        handlers.send_certificate_id_invitation
+    ),
+    (
+        WRONG_CERTIFICATE_MENU, CALLBACK, 'call_person',
+        handlers.handle_activation_problem_button
+    ),
+    (
+        WRONG_CERTIFICATE_MENU, CALLBACK, 'main_menu',
+        handlers.handle_back_to_main_menu_button
+    ),
+    (SELECTING_QUESTION, MESSAGE, ANY, handlers.handle_unrecognized_question),
+    (SELECTING_QUESTION, CALLBACK, 'main_menu', handlers.send_main_menu),
+    (
+        SELECTING_QUESTION, CALLBACK, 'call_person',
+        handlers.handle_question_for_operator_button
+    ),
+]
+
+# Buttons the old if-chains fell through without a branch for.
+UNKNOWN_BUTTONS = [
+    (SELECTING_LANGUAGE, 'german'),
+    (MAIN_MENU, 'main_menu'),
+    (SELECTING_RECEIVING_METHOD, 'faq'),
+    (WAITING_CUSTOMER_EMAIL, 'main_menu'),
+    (WAITING_CUSTOMER_FULLNAME, 'main_menu'),
+    (WAITING_CUSTOMER_PHONE, 'main_menu'),
+    (WAITING_CUSTOMER_CONFIRMATION, 'main_menu'),
+    (WAITING_PAYMENT_SCREENSHOT, 'main_menu'),
+    (DIALOGUE_END, 'faq'),
+    (SELECTING_DELIVERY_METHOD, 'main_menu'),
+    (WAITING_RECIPIENT_NAME, 'main_menu'),
+    (WAITING_RECIPIENT_CONTACT, 'main_menu'),
+    (WAITING_RECIPIENT_CONFIRMATION, 'main_menu'),
+    (CONFIRMING_SELF_DELIVERY, 'main_menu'),
+    (WAITING_CERTIFICATE_ID, 'main_menu'),
+    (WRONG_CERTIFICATE_MENU, 'faq'),
+    (SELECTING_QUESTION, 'faq'),
+]
+
+
+async def handle_anything(update, context):
+    return START
+
+
+class ResolveHandlerTest(SimpleTestCase):
+    def resolve(self, state, input_kind, data):
+        return resolve_handler(
+            handlers.TRANSITIONS,
+            state,
+            input_kind,
+            data,
+            default=handlers.handle_unknown_button
+        )
+
+    def test_old_dispatch(self):
+        for state, input_kind, data, handler in OLD_DISPATCH:
+            with self.subTest(state=state, input_kind=input_kind, data=data):
+                self.assertIs(self.resolve(state, input_kind, data), handler)
+
+    def test_unknown_buttons(self):
+        for state, data in UNKNOWN_BUTTONS:
+            with self.subTest(state=state, data=data):
+                self.assertIs(
+                    self.resolve(state, CALLBACK, data),
+                    handlers.handle_unknown_button
+                )
+
+    def test_every_state_handles_messages(self):
+        for state in get_all_states():
+            with self.subTest(state=state):
+                self.assertIsNot(
+                    self.resolve(state, MESSAGE, ANY),
+                    handlers.handle_unknown_button
+                )
+
+
+class CompileTransitionsTest(SimpleTestCase):
+    def test_missing_state(self):
+        with self.assertRaisesMessage(ValueError, 'START'):
+            compile_transitions({
+                state: {MESSAGE: handle_anything}
+                for state in get_all_states()
+                if state != START
+            })
+
+    def test_unknown_state(self):
+        transitions = {
+            state: {MESSAGE: handle_anything} for state in get_all_states()
+        }
+        transitions[0] = {MESSAGE: handle_anything}
+        with self.assertRaisesMessage(ValueError, 'Unknown state'):
+            compile_transitions(transitions)
+
+    def test_missing_message_handler(self):
+        transitions = {
+            state: {MESSAGE: handle_anything} for state in get_all_states()
+        }
+        transitions[MAIN_MENU] = {CALLBACK: {ANY: handle_anything}}
+        with self.assertRaisesMessage(ValueError, 'MAIN_MENU'):
+            compile_transitions(transitions)
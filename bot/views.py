@@ -1,5 +1,45 @@
-from django.http import JsonResponse
+import hmac
+import json
+
+from django.conf import settings
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    HttpResponseNotAllowed,
+    HttpResponseNotFound,
+    JsonResponse
+)
 
 
 def empty_page(request):
     return JsonResponse([{'text': 'empty page'}], safe=False)
+
+
+async def telegram_webhook(request):
+    if not settings.TELEGRAM_WEBHOOK_URL:
+        return HttpResponseNotFound()
+
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    secret_token = request.headers.get('X-Telegram-Bot-Api-Secret-Token', '')
+    if not settings.TELEGRAM_WEBHOOK_SECRET or not hmac.compare_digest(
+        secret_token.encode(),
+        settings.TELEGRAM_WEBHOOK_SECRET.encode()
+    ):
+        return HttpResponseForbidden()
+
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return HttpResponseBadRequest()
+
+    from bot_utilities.webhook import put_webhook_update
+
+    await put_webhook_update(data)
+    return HttpResponse()
+
+
+# Django 4.2 decorators don't support async views
+telegram_webhook.csrf_exempt = True
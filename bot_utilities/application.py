@@ -0,0 +1,69 @@
+# coding=utf-8
+"""Build the application of the wishlist-shop telegram bot."""
+import os
+
+import django
+from telegram.ext import (
+    Application,
+    CallbackQueryHandler,
+    CommandHandler,
+    ContextTypes,
+    filters,
+    InlineQueryHandler,
+    MessageHandler
+)
+
+from .handlers import handle_all_actions, handle_inline_query
+from .impressions import impressions_cache
+from .jobs import schedule_jobs
+from .outbound import OutboundScheduler
+from .processing import ChatOrderedUpdateProcessor
+from .session import ChatSession
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'impressions.settings')
+django.setup()
+
+from bot.persistence import DjangoPersistence  # noqa: E402
+
+
+async def prepare_application(application: Application) -> None:
+    """Build the impressions catalog before the first update."""
+    await impressions_cache.refresh()
+
+
+def build_application(bot_token: str, webhook: bool = False) -> Application:
+    """Build the bot application with all the handlers.
+
+    In webhook mode the application doesn't poll Telegram: updates are
+    put into its update_queue by the webhook view.
+    """
+    max_concurrent_updates = int(
+        os.environ.get('MAX_CONCURRENT_UPDATES', 32)
+    )
+    builder = (
+        Application.builder()
+        .token(bot_token)
+        .read_timeout(50)
+        .write_timeout(50)
+        .persistence(DjangoPersistence())
+        .context_types(ContextTypes(chat_data=ChatSession))
+        .rate_limiter(OutboundScheduler())
+        .post_init(prepare_application)
+        .concurrent_updates(
+            ChatOrderedUpdateProcessor(max_concurrent_updates)
+        )
+    )
+    if webhook:
+        builder = builder.updater(None)
+    else:
+        builder = builder.get_updates_read_timeout(50)
+    application = builder.build()
+
+    application.add_handler(CallbackQueryHandler(handle_all_actions))
+    application.add_handler(MessageHandler(filters.TEXT, handle_all_actions))
+    application.add_handler(MessageHandler(filters.PHOTO, handle_all_actions))
+    application.add_handler(CommandHandler('start', handle_all_actions))
+    application.add_handler(InlineQueryHandler(handle_inline_query))
+
+    schedule_jobs(application.job_queue)
+    return application
@@ -0,0 +1,560 @@
+# coding=utf-8
+"""Keep texts and keyboards of the wishlist-shop telegram bot."""
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.ext import ContextTypes
+
+from bot.choices import LANGUAGES
+
+DEFAULT_LANGUAGE = 'russian'
+
+# Telegram language codes of users, e.g. for inline queries.
+LANGUAGE_CODES = {
+    'ru': 'russian',
+    'en': 'english',
+}
+
+LANGUAGE_MENU_TEXT = 'Выбери, пожалуйста, язык / Please select a language'
+
+KeyboardLayout = List[List[Tuple[str, str]]]
+
+# Rows of (button, callback data) pairs, buttons are translated below.
+KEYBOARD_LAYOUTS: Dict[str, KeyboardLayout] = {
+    'main_menu': [
+        [('select_impression', 'impression')],
+        [('activate_certificate', 'certificate')],
+        [('faq', 'faq')],
+    ],
+    'impressions_categories': [
+        [('for_men', 'man')],
+        [('for_girls', 'girl')],
+        [('for_couples', 'couple')],
+        [('view_all', 'all')],
+        [('back_to_main_menu', 'main_menu')],
+    ],
+    'impressions': [
+        [('back_to_categories', 'category_menu')],
+    ],
+    'impressions_first_page': [
+        [('next_page', 'impressions_next_page')],
+        [('back_to_categories', 'category_menu')],
+    ],
+    'impressions_middle_page': [
+        [
+            ('previous_page', 'impressions_previous_page'),
+            ('next_page', 'impressions_next_page'),
+        ],
+        [('back_to_categories', 'category_menu')],
+    ],
+    'impressions_last_page': [
+        [('previous_page', 'impressions_previous_page')],
+        [('back_to_categories', 'category_menu')],
+    ],
+    'receiving_methods': [
+        [('gift_box', 'gift_box')],
+        [('email', 'email')],
+        [('other_impression', 'impression')],
+        [('back_to_main_menu', 'main_menu')],
+    ],
+    'privacy_policy': [
+        [('acquainted', 'privacy_policy')],
+    ],
+    'customer_confirmation': [
+        [('right_data', 'right_customer')],
+        [('correct_data', 'wrong_customer')],
+    ],
+    'recipient_confirmation': [
+        [('right_data', 'right_recipient')],
+        [('correct_data', 'wrong_recipient')],
+    ],
+    'dialogue_end': [
+        [('thanks_back_to_main_menu', 'main_menu')],
+    ],
+    'delivery_methods': [
+        [
+            ('courier_delivery', 'courier_delivery'),
+            ('self_delivery', 'self_delivery'),
+        ],
+    ],
+    'self_delivery': [
+        [
+            ('self_delivery_yes', 'self_delivery_yes'),
+            ('back_to_delivery_methods', 'self_delivery_no'),
+        ],
+    ],
+    'wrong_certificate': [
+        [
+            ('enter_id_again', 'certificate_id'),
+            ('call_person', 'call_person'),
+        ],
+        [('thanks_back_to_main_menu', 'main_menu')],
+    ],
+    'faq': [
+        [('call_person', 'call_person')],
+        [('back_to_main_menu', 'main_menu')],
+    ],
+}
+
+BUTTONS = {
+    'russian': {
+        'select_impression': 'Выбрать впечатление',
+        'activate_certificate': 'Активировать сертификат',
+        'faq': 'F.A.Q. и поддержка',
+        'for_men': 'Для мужчин',
+        'for_girls': 'Для девушек',
+        'for_couples': 'Для пар',
+        'view_all': 'Посмотреть все',
+        'back_to_main_menu': '« Вернуться в главное меню',
+        'back_to_categories': '‹  Вернуться к выбору категории',
+        'previous_page': '‹ Назад',
+        'next_page': 'Дальше ›',
+        'gift_box': '🎁 Сертификат в коробке',
+        'email': '💌 Электронный сертификат',
+        'other_impression': '‹ Выбрать другое впечатление',
+        'acquainted': 'Ознакомлен(а)',
+        'right_data': 'Да, верно',
+        'correct_data': 'Исправить данные',
+        'thanks_back_to_main_menu': 'Спасибо 👌, вернуться в главное меню',
+        'courier_delivery': 'Доставка курьером',
+        'self_delivery': 'Самовывоз',
+        'self_delivery_yes': 'Мне подходит',
+        'back_to_delivery_methods': '‹ Назад к способам доставки',
+        'enter_id_again': 'Ввести ID снова',
+        'call_person': 'Позвать человека',
+    },
+    'english': {
+        'select_impression': 'Select Impression',
+        'activate_certificate': 'Activate Certificate',
+        'faq': 'F.A.Q. and Support',
+        'for_men': 'For Men',
+        'for_girls': 'For Girls',
+        'for_couples': 'For Couples',
+        'view_all': 'View All',
+        'back_to_main_menu': '« Back to main menu',
+        'back_to_categories': '‹  Back to category selection',
+        'previous_page': '‹ Previous',
+        'next_page': 'Next ›',
+        'gift_box': '🎁 Certificate in a box',
+        'email': '💌 Electronic certificate',
+        'other_impression': '‹ Choose a different impression',
+        'acquainted': 'Acquainted',
+        'right_data': "Yes, that's right",
+        'correct_data': 'Correct the data',
+        'thanks_back_to_main_menu': 'Thanks 👌, back to the main menu',
+        'courier_delivery': 'Courier delivery',
+        'self_delivery': 'Self-delivery',
+        'self_delivery_yes': 'It works for me',
+        'back_to_delivery_methods': '‹ Back to delivery methods',
+        'enter_id_again': 'Enter ID again',
+        'call_person': 'Call Person',
+    },
+}
+
+# Templates are filled with str.format, `text` is a prefix of the message.
+TEXTS = {
+    'russian': {
+        'misunderstanding': (
+            'Извини, непонятно, что ты хочешь выбрать. '
+            'Попробуй ещё раз.\n\n'
+        ),
+        'main_menu': '{text}Выбери, пожалуйста, что ты хочешь сделать',
+        'impressions_categories': (
+            '{text}Для твоего удобства мы разделили подарки по нескольким '
+            'категориям:\n\n'
+        ),
+        'unrecognized_impressions_category': (
+            'Извини, непонятно, какую категорию впечатлений ты хочешь '
+            'выбрать. Попробуй ещё раз.\n\n'
+        ),
+        'no_impressions': 'Извини, впечатлений пока нет.\n',
+        'impressions_title_man': 'Это лучшие подарки для мужчин на Бали🔥',
+        'impressions_title_girl': (
+            'Это лучшие подарки для девушек на Бали 😍'
+        ),
+        'impressions_title_couple': (
+            'Эти подарки идеально подходят для пар ♥'
+        ),
+        'impressions': (
+            'Нажимай на впечатление, чтобы прочитать о нём подробнее.\n'
+            'Когда выберешь подходящее, отправь боту его номер, чтобы '
+            'перейти к покупке.\n\n'
+        ),
+        'impressions_page': 'Страница {page} из {pages_count}\n\n',
+        'impressions_updated': (
+            'Список впечатлений обновился, проверь, пожалуйста, номер.\n\n'
+        ),
+        'unrecognized_impression': (
+            'Извини, непонятно, какое впечатление ты хочешь '
+            'выбрать. Попробуй ещё раз.\n\n'
+        ),
+        'receiving_methods': (
+            '{text}Отличный выбор! Ты выбрал(а) сертификат:\n'
+            '*{impression_title}*\n\nВ какой форме хочешь получить его?'
+        ),
+        'unrecognized_receiving_method': (
+            'Извини, непонятно, какой способ получения сертификата ты '
+            'хочешь выбрать. Попробуй ещё раз.\n\n'
+        ),
+        'customer_email_invitation': (
+            'Напиши почту, на которую хотел(а) бы получить сертификат:'
+        ),
+        'customer_email_error': (
+            'Ошибка в написании электронной почты.\n'
+            'Пожалуйста, пришли нам свой адрес электронной почты:'
+        ),
+        'privacy_policy': (
+            'Спасибо, записали 👌\n\n'
+            'Пожалуйста, ознакомься с [Политикой конфиденциальности и '
+            'положением об обработке персональных данных 📇]({policy_url})'
+        ),
+        'customer_fullname_invitation': (
+            'Введи, пожалуйста, свои фамилию и имя (кириллицей):'
+        ),
+        'customer_fullname_error': (
+            'Ошибка в написании фамилии и имени.\n'
+            'Пожалуйста, пришли нам фамилию и имя (кириллицей):'
+        ),
+        'customer_phone_invitation': (
+            'Оставь, пожалуйста, свой контактный номер телефона:'
+        ),
+        'customer_phone_error': (
+            'Введён некорректный номер телефона.\n'
+            'Пожалуйста, пришли нам свой номер телефона:'
+        ),
+        'data_confirmation': (
+            '{text}Ты ввел(а):\n{name}\n{contact}\n\nВсё верно?'
+        ),
+        'unrecognized_customer_confirmation': (
+            'Извини, непонятно, подтверждаешь ли ты, что верно ввёл свои '
+            'ФИО и номер телефона.\n'
+            'Нужно нажать на соответствующую кнопку.\n\n'
+        ),
+        'data_correction': 'Исправление данных:',
+        'payment_invitation': (
+            '{text}Оплатить покупку можно по указанным реквизитам:\n\n*'
+            '{payment_details}'
+            '\n\n*После оплаты отправь нам скриншот с подтверждением оплаты:'
+        ),
+        'not_payment_screenshot': 'Ты прислал не скриншот оплаты.\n\n',
+        'payment_screenshot_received': (
+            'Спасибо за покупку! Мы всё проверим '
+            'и в ближайшее время тебе напишет оператор 🎆'
+        ),
+        'delivery_methods': (
+            '{text}Спасибо!\n'
+            'Подскажи, как тебе удобнее получить сертификат\n\n'
+            'Пункт самовывоза находится на Буките\n\n'
+            'Стоимость доставки зависит от района'
+        ),
+        'unrecognized_delivery_method': (
+            'Извини, непонятно, какой способ доставки ты хочешь выбрать. '
+            'Попробуй ещё раз.\n\n'
+        ),
+        'recipient_name_invitation': 'Введи имя получателя (кириллицей):',
+        'recipient_name_error': (
+            'Ошибка в написании имени.\n'
+            'Пожалуйста, пришли нам имя (кириллицей):'
+        ),
+        'recipient_contact_invitation': (
+            'Как нам связаться с получателем?\n\n'
+            'Напиши номер в WhatsApp или ник в Telegram:'
+        ),
+        'recipient_contact_error': (
+            'Ошибка в присланных контактах.\nПожалуйста, '
+            'пришли нам номер в WhatsApp или ник в Telegram:'
+        ),
+        'unrecognized_recipient_confirmation': (
+            'Извини, непонятно, подтверждаешь ли ты, что верно ввёл '
+            'имя и контакт получателя.\n'
+            'Нужно нажать на соответствующую кнопку.\n\n'
+        ),
+        'successful_booking': (
+            'Мы забронировали сертификат ✨\n\n'
+            'В ближайшее время тебе напишет оператор'
+        ),
+        'checkout_reminder': (
+            'Ты начал(а) оформлять сертификат, но не закончил(а) 🎁\n\n'
+            'Чтобы продолжить, вернись к последнему сообщению бота выше. '
+            'Чтобы начать заново, нажми /start'
+        ),
+        'self_delivery': (
+            '{text}Самовывоз доступен по адресу:\n{address}'
+            '\n\nЧасы работы:\n{opening_hours}'
+        ),
+        'certificate_greeting': (
+            'Поздравляем - близкий человек подарил тебе прекрасные '
+            'впечатления!\nОкунёмся в мир невероятных эмоций?\n\n'
+        ),
+        'certificate_id_invitation': (
+            '{text}Введи ID сертификата, чтобы активировать его:'
+        ),
+        'good_certificate': (
+            'Твое впечатление это -\n'
+            '*{impression_name}*\n'
+            'Прекрасный выбор!\n\n'
+            'В течение часа с тобой свяжется оператор\n'
+            'и расскажет все детали.\n'
+            'До скорых встреч ✋'
+        ),
+        'wrong_certificate_beginning': 'Что-то пошло не так\n',
+        'wrong_certificate': (
+            '{text}Проверь, пожалуйста, правильно ли ты ввел(а) '
+            'ID и действителен ли срок действия сертификата\n\n'
+            'Если тебе нужна помощь, нажми кнопку "Позвать человека"'
+        ),
+        'calling_person': (
+            'Спасибо за обращение, поддержка ответит в ближайшее время'
+        ),
+        'faq': 'Нажми на вопрос, чтобы прочитать ответ на него.\n\n',
+        'empty_faq': 'Извини, FAQ пока пусто.\n\n',
+        'unrecognized_question': (
+            'Извини, непонятно, что ты хочешь выбрать. '
+            'Нажми на кнопку.\n\n'
+        ),
+    },
+    'english': {
+        'misunderstanding': (
+            "Sorry, it's not clear what you want to choose. "
+            "Try again.\n\n"
+        ),
+        'main_menu': '{text}Please choose what you want to do',
+        'impressions_categories': (
+            '{text}For your convenience, we have divided gifts into several '
+            'categories:\n\n'
+        ),
+        'unrecognized_impressions_category': (
+            "Sorry, it's not clear which impressions category you want to "
+            "choose. Try again.\n\n"
+        ),
+        'no_impressions': 'Sorry, no impressions yet.\n',
+        'impressions_title_man': 'These are the best gifts for men in Bali🔥',
+        'impressions_title_girl': (
+            'These are the best gifts for girls in Bali 😍'
+        ),
+        'impressions_title_couple': 'These are perfect gifts for couples ♥',
+        'impressions': (
+            'Click on an impression to read more about it.\n'
+            'When you choose the right one, send the bot its number '
+            'to proceed to purchase.\n\n'
+        ),
+        'impressions_page': 'Page {page} of {pages_count}\n\n',
+        'impressions_updated': (
+            'The list of impressions has been updated, '
+            'please check the number.\n\n'
+        ),
+        'unrecognized_impression': (
+            "Sorry, it's not clear which impression you want to "
+            "choose. Try again.\n\n"
+        ),
+        'receiving_methods': (
+            '{text}Great choice! You chose the certificate:\n'
+            '*{impression_title}*\n\nIn what form do you want to receive it?'
+        ),
+        'unrecognized_receiving_method': (
+            "Sorry, it's not clear which method of receiving "
+            "your certificate you want to choose. "
+            "Try again.\n\n"
+        ),
+        'customer_email_invitation': (
+            'Write the email to which you would like to receive '
+            'the certificate:'
+        ),
+        'customer_email_error': (
+            'Email spelling error.\nPlease send us your email:'
+        ),
+        'privacy_policy': (
+            'Thank you, we wrote it down 👌\n\n'
+            'Please read the *[Privacy Policy and the provisions '
+            'on the processing of personal data 📇]({policy_url})*'
+        ),
+        'customer_fullname_invitation': (
+            'Please write your first and last name:'
+        ),
+        'customer_fullname_error': (
+            'First and last name spelling error.\n'
+            'Please send us the first and last name:'
+        ),
+        'customer_phone_invitation': 'Please write your contact phone number:',
+        'customer_phone_error': (
+            'Phone number spelling error.\n'
+            'Please send us your phone number:'
+        ),
+        'data_confirmation': (
+            "{text}Here's what you entered:\n{name}\n{contact}\n\n"
+            "Is that right?"
+        ),
+        'unrecognized_customer_confirmation': (
+            "Sorry, it's not clear if you are confirming that you have "
+            "entered your full name and phone number correctly.\n"
+            "You need to click the appropriate button.\n\n"
+        ),
+        'data_correction': 'Correction of data:',
+        'payment_invitation': (
+            '{text}You can pay for the purchase by the specified details:'
+            '\n\n*{payment_details}'
+            '\n\n*After payment, send us a screenshot with payment:'
+            'confirmation'
+        ),
+        'not_payment_screenshot': (
+            "You didn't send a screenshot of the payment\n\n"
+        ),
+        'payment_screenshot_received': (
+            'Thank you for your purchase! We will check everything '
+            'and an operator will write to you shortly 🎆'
+        ),
+        'delivery_methods': (
+            '{text}Thank you!\n'
+            'Tell me how you can get the certificate\n\n'
+            'The self-delivery point is on Bukit.\n\n'
+            'Delivery cost depends on the neighbourhood'
+        ),
+        'unrecognized_delivery_method': (
+            "Sorry, it's not clear which delivery method you want "
+            "to choose. Try again.\n\n"
+        ),
+        'recipient_name_invitation': 'Please write the recipient name:',
+        'recipient_name_error': (
+            'First and last name spelling error.\n'
+            'Please send us the name:'
+        ),
+        'recipient_contact_invitation': (
+            'How do we contact the recipient?\n\n'
+            'Write the number in WhatsApp or nickname in Telegram:'
+        ),
+        'recipient_contact_error': (
+            'Error in spelling of contacts.\nPlease '
+            'send us the number in WhatsApp or nickname in Telegram:'
+        ),
+        'unrecognized_recipient_confirmation': (
+            "Sorry, it's not clear if you are confirming that you have "
+            "entered the recipient's name and contact correctly.\n"
+            "You need to click the appropriate button.\n\n"
+        ),
+        'successful_booking': (
+            "We've booked the certificate ✨\n\n"
+            "An operator will write to you shortly"
+        ),
+        'checkout_reminder': (
+            "You started ordering a certificate but didn't finish 🎁\n\n"
+            "To continue, go back to the bot's last message above. "
+            "To start over, press /start"
+        ),
+        'self_delivery': (
+            '{text}Self-collection is available at the address:\n{address}'
+            '\n\nOpening hours:\n{opening_hours}'
+        ),
+        'certificate_greeting': (
+            "Congratulations - a loved one has given you a wonderful "
+            "experience!\nLet's dive into the world of incredible "
+            "emotions?\n\n"
+        ),
+        'certificate_id_invitation': (
+            '{text}Write your certificate ID to activate it:'
+        ),
+        'good_certificate': (
+            'Your impression is\n'
+            '*{impression_name}*\n'
+            'Excellent choice!\n\n'
+            'An operator will contact you within an hour\n'
+            'with all the details.\n'
+            'See you soon ✋'
+        ),
+        'wrong_certificate_beginning': 'Something went wrong\n',
+        'wrong_certificate': (
+            '{text}Please check if you have entered the ID '
+            'correctly and if the certificate expiry date is valid\n\n'
+            'If you need help, click the "Call Person" button'
+        ),
+        'calling_person': (
+            'Thank you for contacting us, support will respond shortly'
+        ),
+        'faq': 'Click on a question to read the answer to it.\n\n',
+        'empty_faq': 'Sorry, the FAQ is empty for now.\n\n',
+        'unrecognized_question': (
+            "Sorry, it's not clear what you want to choose. "
+            "Click on the button.\n\n"
+        ),
+    },
+}
+
+
+class Catalog(NamedTuple):
+    """Texts and keyboards of a language."""
+
+    texts: Mapping[str, str]
+    keyboards: Mapping[str, InlineKeyboardMarkup]
+
+
+def build_keyboard(
+    layout: KeyboardLayout,
+    buttons: Dict[str, str]
+) -> InlineKeyboardMarkup:
+    """Build the keyboard with the translated buttons."""
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton(buttons[button], callback_data=callback_data)
+            for button, callback_data in row
+        ]
+        for row in layout
+    ])
+
+
+def compile_catalogs() -> Dict[str, Catalog]:
+    """Build the catalogs of all the languages once.
+
+    Telegram objects are immutable, so the keyboards are shared by all
+    the chats. Raises ValueError if a language misses a text or
+    a button.
+    """
+    all_texts = set().union(*TEXTS.values())
+    all_buttons = {
+        button
+        for layout in KEYBOARD_LAYOUTS.values()
+        for row in layout
+        for button, _ in row
+    }
+
+    catalogs = {}
+    for language in LANGUAGES:
+        texts = TEXTS.get(language, {})
+        buttons = BUTTONS.get(language, {})
+        missing_texts = all_texts - set(texts)
+        missing_buttons = all_buttons - set(buttons)
+        if missing_texts or missing_buttons:
+            raise ValueError(
+                f'Language {language} has no texts {sorted(missing_texts)} '
+                f'and no buttons {sorted(missing_buttons)}'
+            )
+
+        keyboards = {
+            name: build_keyboard(layout, buttons)
+            for name, layout in KEYBOARD_LAYOUTS.items()
+        }
+        catalogs[language] = Catalog(
+            texts=MappingProxyType(dict(texts)),
+            keyboards=MappingProxyType(keyboards)
+        )
+    return catalogs
+
+
+CATALOGS = compile_catalogs()
+
+LANGUAGE_MENU_KEYBOARD = InlineKeyboardMarkup([[
+    InlineKeyboardButton(button, callback_data=language)
+    for language, button in LANGUAGES.items()
+]])
+
+
+def get_catalog(context: ContextTypes.DEFAULT_TYPE) -> Catalog:
+    """Return the catalog of the chat language."""
+    language = context.chat_data.language
+    return CATALOGS.get(language) or CATALOGS[DEFAULT_LANGUAGE]
+
+
+def get_language_by_code(language_code: Optional[str]) -> str:
+    """Return the language of a Telegram user language code."""
+    if not language_code:
+        return DEFAULT_LANGUAGE
+    return LANGUAGE_CODES.get(language_code[:2], DEFAULT_LANGUAGE)
@@ -1,5 +1,6 @@
 # coding=utf-8
 """Handle all the actions of the wishlist-shop telegram bot."""
+import asyncio
 import io
 import os
 import re
@@ -7,18 +8,24 @@ import re
 import django
 import phonenumbers
 from telegram import (
-    # InlineKeyboardButton,
-    # InlineKeyboardMarkup,
+    InlineQueryResultArticle,
+    InputTextMessageContent,
     Update
 )
 from telegram.ext import ContextTypes
 
+from .catalog import get_catalog, get_language_by_code, LANGUAGES
 from .errors import (
     send_fullname_error_message, send_name_error_message,
     send_phone_error_message
 )
 from .history import (
-    add_message_to_history, clear_history, delete_last_history_message
+    add_message_to_history, clear_history, delete_last_history_message,
+    message_cleaner
+)
+from .impressions import (
+    CATEGORY_FIELDS, get_impressions_menu, IMPRESSIONS_CACHE_TTL,
+    impressions_cache
 )
 from .invitations import (
     send_certificate_id_invitation, send_customer_fullname_invitation,
@@ -34,8 +41,7 @@ from .menus import (
     send_screenshot_receiving_menu, send_self_delivery_menu,
     send_successful_booking_menu, send_wrong_certificate_menu
 )
-from .messages import get_misunderstanding_message
-
+from .messages import answer_callback_query, edit_message_text
 from .states import (
     START, SELECTING_LANGUAGE, MAIN_MENU, SELECTING_IMPRESSIONS_CATEGORY,
     SELECTING_IMPRESSION, SELECTING_RECEIVING_METHOD, WAITING_CUSTOMER_EMAIL,
@@ -46,6 +52,9 @@ from .states import (
     WAITING_RECIPIENT_CONFIRMATION, CONFIRMING_SELF_DELIVERY,
     WAITING_CERTIFICATE_ID, WRONG_CERTIFICATE_MENU, SELECTING_QUESTION
 )
+from .transitions import (
+    ANY, CALLBACK, MESSAGE, compile_transitions, resolve_handler
+)
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'impressions.settings')
 django.setup()
@@ -58,45 +67,46 @@ async def handle_all_actions(
     context: ContextTypes.DEFAULT_TYPE
 ) -> None:
     """Handle all user actions."""
-    if not update.message and not update.callback_query:
+    if update.callback_query:
+        input_kind = CALLBACK
+        callback_data = update.callback_query.data
+        user_reply = callback_data
+    elif update.message:
+        input_kind = MESSAGE
+        callback_data = ANY
+        user_reply = update.message.text
+    else:
         return
 
-    user_reply = (
-        update.message.text
-        if update.message
-        else update.callback_query.data
-    )
-    states_functions = {
-        START: handle_start_command,
-        SELECTING_LANGUAGE: handle_language_menu,
-        MAIN_MENU: handle_main_menu,
-        SELECTING_IMPRESSIONS_CATEGORY: handle_impressions_categories_menu,
-        SELECTING_IMPRESSION: handle_impressions_menu,
-        SELECTING_RECEIVING_METHOD: handle_receiving_methods_menu,
-        WAITING_CUSTOMER_EMAIL: handle_customer_email_message,
-        ACQUAINTED_PRIVACY_POLICY: handle_privacy_policy_button,
-        WAITING_CUSTOMER_FULLNAME: handle_customer_fullname_message,
-        WAITING_CUSTOMER_PHONE: handle_customer_phone_message,
-        WAITING_CUSTOMER_CONFIRMATION: handle_customer_confirmation,
-        WAITING_PAYMENT_SCREENSHOT: handle_payment_screenshot,
-        DIALOGUE_END: handle_dialogue_end,
-        SELECTING_DELIVERY_METHOD: handle_delivery_methods_menu,
-        WAITING_RECIPIENT_NAME: handle_recipient_name_message,
-        WAITING_RECIPIENT_CONTACT: handle_recipient_contact_message,
-        WAITING_RECIPIENT_CONFIRMATION: handle_recipient_confirmation,
-        CONFIRMING_SELF_DELIVERY: handle_self_delivery_menu,
-        WAITING_CERTIFICATE_ID: handle_certificate_id_message,
-        WRONG_CERTIFICATE_MENU: handle_wrong_certificate_menu,
-        SELECTING_QUESTION: handle_faq_menu
-    }
     chat_state = (
         START
         if user_reply == '/start'
-        else context.chat_data.get('next_state') or START
+        else context.chat_data.next_state or START
     )
-    state_handler = states_functions[int(chat_state)]
-    next_state = await state_handler(update, context)
-    context.chat_data['next_state'] = next_state
+    state_handler = resolve_handler(
+        TRANSITIONS,
+        int(chat_state),
+        input_kind,
+        callback_data,
+        default=handle_unknown_button
+    )
+    if update.callback_query:
+        next_state, _ = await asyncio.gather(
+            state_handler(update, context),
+            answer_callback_query(update)
+        )
+    else:
+        next_state = await state_handler(update, context)
+    context.chat_data.next_state = next_state
+    message_cleaner.flush(context.application, update.effective_chat['id'])
+
+
+async def handle_unknown_button(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Handle a button click unexpected in the current state."""
+    return context.chat_data.next_state or START
 
 
 async def handle_start_command(
@@ -104,125 +114,103 @@ async def handle_start_command(
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
     """Handle the start command."""
-    await clear_history(update, context)
+    clear_history(update, context)
     context.chat_data.clear()
-    context.chat_data['messages_history'] = []
 
     next_state = await send_language_menu(update, context)
     return next_state
 
 
-async def handle_language_menu(
+async def handle_language_button(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    """Handle Language selecting menu."""
-    if not update.callback_query:
-        next_state = await handle_start_command(update, context)
-        return next_state
-
-    await update.callback_query.answer()
-    context.chat_data['language'] = update.callback_query.data
+    """Handle Language button click."""
+    context.chat_data.language = update.callback_query.data
 
     next_state = await send_main_menu(update, context)
     return next_state
 
 
-async def handle_main_menu(
+async def handle_unrecognized_main_menu_item(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    """Handle Main menu."""
-    if not update.callback_query:
-        text = get_misunderstanding_message(context.chat_data['language'])
-        next_state = await send_main_menu(update, context, text)
-        return next_state
-
-    await update.callback_query.answer()
-
-    if update.callback_query.data == 'impression':
-        next_state = await send_impressions_categories_menu(update, context)
-        return next_state
-
-    if update.callback_query.data == 'certificate':
-        next_state = await handle_certificate_button(update, context)
-        return next_state
-
-    if update.callback_query.data == 'faq':
-        next_state = await send_faq_menu(update, context)
-        return next_state
+    """Handle Unrecognized main menu item."""
+    text = get_catalog(context).texts['misunderstanding']
+    next_state = await send_main_menu(update, context, text)
+    return next_state
 
 
-async def handle_impressions_categories_menu(
+async def handle_unrecognized_impressions_category(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    """Handle Impressions Category selecting."""
-    if not update.callback_query:
-        next_state = await handle_unrecognized_impressions_category(
-            update, context
-        )
-        return next_state
+    """Handle Unrecognized impressions category."""
+    text = get_catalog(context).texts['unrecognized_impressions_category']
 
-    await update.callback_query.answer()
+    next_state = await send_impressions_categories_menu(update, context, text)
+    return next_state
 
-    if update.callback_query.data == 'main_menu':
-        next_state = await send_main_menu(update, context)
-        return next_state
 
+async def handle_impressions_category_button(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Handle Impressions category button click."""
+    context.chat_data.impressions_menu = [
+        update.callback_query.data, 0, None
+    ]
     next_state = await send_impressions_menu(update, context)
     return next_state
 
 
-async def handle_unrecognized_impressions_category(
+async def handle_impressions_page_button(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    """Handle Unrecognized impressions category."""
-    if context.chat_data['language'] == 'russian':
-        text = (
-            'Извини, непонятно, какую категорию впечатлений ты хочешь '
-            'выбрать. Попробуй ещё раз.\n\n'
-        )
+    """Handle Next page and Previous page buttons click."""
+    category, page, version = get_impressions_menu(context.chat_data)
+    if update.callback_query.data == 'impressions_next_page':
+        page += 1
     else:
-        text = (
-            "Sorry, it's not clear which impressions category you want to "
-            "choose. Try again.\n\n"
-        )
-
-    next_state = await send_impressions_categories_menu(update, context, text)
+        page -= 1
+    context.chat_data.impressions_menu = [category, page, version]
+    next_state = await send_impressions_menu(update, context)
     return next_state
 
 
-async def handle_impressions_menu(
+async def handle_impression_number_message(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    """Handle Impression selecting."""
-    if update.callback_query:
-        await update.callback_query.answer()
-        if update.callback_query.data == 'category_menu':
-            next_state = await send_impressions_categories_menu(
-                update, context
-            )
-            return next_state
-
-        next_state = await handle_unrecognized_impression(update, context)
-        return next_state
-
+    """Handle Impression selecting by its number."""
     impression_number = update.message.text.strip()
     if not impression_number.isnumeric():
         next_state = await handle_unrecognized_impression(update, context)
         return next_state
 
     impression_index = int(impression_number) - 1
-    impressions_ids = context.chat_data.get('impressions_ids', [])
-    if impression_index < 0 or len(impressions_ids) <= impression_index:
+    category, _, version = get_impressions_menu(context.chat_data)
+    impressions_catalog = impressions_cache.catalog
+    menu_version = impressions_catalog.get_menu_version(
+        context.chat_data.language,
+        category
+    )
+    if version != menu_version:
+        text = get_catalog(context).texts['impressions_updated']
+        next_state = await send_impressions_menu(update, context, text)
+        return next_state
+
+    impressions = impressions_catalog.get_impressions(
+        context.chat_data.language,
+        category
+    )
+    if impression_index < 0 or len(impressions) <= impression_index:
         next_state = await handle_unrecognized_impression(update, context)
         return next_state
 
-    impression_id = impressions_ids[impression_index]
-    context.chat_data['impression_id'] = impression_id
+    context.chat_data.impression_id = impressions[impression_index].id
     next_state = await send_receiving_methods_menu(update, context)
     return next_state
 
@@ -232,58 +220,20 @@ async def handle_unrecognized_impression(
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
     """Handle Unrecognized impression."""
-    if context.chat_data['language'] == 'russian':
-        text = (
-            'Извини, непонятно, какое впечатление ты хочешь '
-            'выбрать. Попробуй ещё раз.\n\n'
-        )
-    else:
-        text = (
-            "Sorry, it's not clear which impression you want to "
-            "choose. Try again.\n\n"
-        )
+    text = get_catalog(context).texts['unrecognized_impression']
 
     next_state = await send_impressions_menu(update, context, text)
     return next_state
 
 
-async def handle_receiving_methods_menu(
+async def handle_unrecognized_receiving_method(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    """Handle Receipt method selecting."""
-    if not update.callback_query:
-        if context.chat_data['language'] == 'russian':
-            text = (
-                'Извини, непонятно, какой способ получения сертификата ты '
-                'хочешь выбрать. Попробуй ещё раз.\n\n'
-            )
-        else:
-            text = (
-                "Sorry, it's not clear which method of receiving "
-                'your certificate you want to choose. '
-                'Try again.\n\n'
-            )
-        next_state = await send_receiving_methods_menu(update, context, text)
-        return next_state
-
-    await update.callback_query.answer()
-
-    if update.callback_query.data == 'main_menu':
-        next_state = await send_main_menu(update, context)
-        return next_state
-
-    if update.callback_query.data == 'impression':
-        next_state = await send_impressions_categories_menu(update, context)
-        return next_state
-
-    if update.callback_query.data == 'email':
-        next_state = await handle_email_button(update, context)
-        return next_state
-
-    if update.callback_query.data == 'gift_box':
-        next_state = await handle_giftbox_button(update, context)
-        return next_state
+    """Handle Unrecognized receiving method."""
+    text = get_catalog(context).texts['unrecognized_receiving_method']
+    next_state = await send_receiving_methods_menu(update, context, text)
+    return next_state
 
 
 async def handle_email_button(
@@ -291,15 +241,9 @@ async def handle_email_button(
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
     """Handle Email button click."""
-    context.chat_data['receiving_method'] = 'email'
-    if context.chat_data['language'] == 'russian':
-        text = 'Напиши почту, на которую хотел(а) бы получить сертификат:'
-    else:
-        text = (
-            'Write the email to which you would like to receive '
-            'the certificate:'
-        )
-    message = await update.callback_query.edit_message_text(text=text)
+    context.chat_data.receiving_method = 'email'
+    text = get_catalog(context).texts['customer_email_invitation']
+    message = await edit_message_text(update, context, text=text)
     add_message_to_history(context, message)
     return WAITING_CUSTOMER_EMAIL
 
@@ -314,19 +258,13 @@ async def handle_customer_email_message(
     pattern = r'(^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$)'
     match = re.match(pattern, update.message.text.strip())
     if not match:
-        if context.chat_data['language'] == 'russian':
-            text = (
-                'Ошибка в написании электронной почты.\n'
-                'Пожалуйста, пришли нам свой адрес электронной почты:'
-            )
-        else:
-            text = 'Email spelling error.\nPlease send us your email:'
+        text = get_catalog(context).texts['customer_email_error']
 
         message = await update.message.reply_text(text=text)
         add_message_to_history(context, message)
         return WAITING_CUSTOMER_EMAIL
 
-    context.chat_data['customer_email'] = match.groups()[0]
+    context.chat_data.customer_email = match.groups()[0]
     next_state = await send_privacy_policy_menu(update, context)
     return next_state
 
@@ -336,7 +274,7 @@ async def handle_giftbox_button(
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
     """Handle Gift-box button click."""
-    context.chat_data['receiving_method'] = 'gift_box'
+    context.chat_data.receiving_method = 'gift_box'
     next_state = await send_privacy_policy_menu(update, context)
     return next_state
 
@@ -346,11 +284,7 @@ async def handle_privacy_policy_button(
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
     """Handle Privacy Policy button click."""
-    if not update.callback_query:
-        next_state = await send_privacy_policy_menu(update, context)
-        return next_state
-
-    await clear_history(update, context)
+    clear_history(update, context)
     next_state = await send_customer_fullname_invitation(update, context)
     return next_state
 
@@ -367,7 +301,7 @@ async def handle_customer_fullname_message(
         next_state = await send_fullname_error_message(update, context)
         return next_state
 
-    context.chat_data['customer_fullname'] = customer_fullname
+    context.chat_data.customer_fullname = customer_fullname
     next_state = await send_customer_phone_invitation(update, context)
     return next_state
 
@@ -397,7 +331,7 @@ async def handle_customer_phone_message(
         next_state = await send_phone_error_message(update, context)
         return next_state
 
-    context.chat_data['customer_phone'] = (
+    context.chat_data.customer_phone = (
         f'+{value.country_code}{value.national_number}'
     )
 
@@ -405,62 +339,50 @@ async def handle_customer_phone_message(
     return next_state
 
 
-async def handle_customer_confirmation(
+async def handle_unrecognized_customer_confirmation(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    """Handle the WAITING_CUSTOMER_CONFIRMATION state."""
-    if not update.callback_query:
-        await context.bot.delete_message(
-            update.effective_chat['id'],
-            update.message.message_id
-        )
-        await delete_last_history_message(update, context)
-
-        if context.chat_data['language'] == 'russian':
-            text = (
-                "Извини, непонятно, подтверждаешь ли ты, что верно ввёл свои "
-                "ФИО и номер телефона.\n"
-                "Нужно нажать на соответствующую кнопку.\n\n"
-            )
-        else:
-            text = (
-                "Sorry, it's not clear if you are confirming that you have "
-                "entered your full name and phone number correctly.\n"
-                "You need to click the appropriate button.\n\n"
-            )
-        next_state = await send_customer_confirmation_menu(
-            update, context, text
-        )
-        return next_state
+    """Handle a message instead of the customer confirmation."""
+    delete_last_history_message(update, context)
+    message_cleaner.schedule(context, [update.message.message_id])
 
-    await update.callback_query.answer()
+    text = get_catalog(context).texts['unrecognized_customer_confirmation']
+    next_state = await send_customer_confirmation_menu(update, context, text)
+    return next_state
 
-    if update.callback_query.data == 'right_customer':
-        if context.chat_data['receiving_method'] == 'email':
-            await clear_history(update, context, last_message_deletion=False)
-            next_state = await send_payment_invitation(update, context)
-            return next_state
 
-        next_state = await send_delivery_methods_menu(update, context)
+async def handle_right_customer_button(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Handle confirmation of the customer fullname and phone number."""
+    if context.chat_data.receiving_method == 'email':
+        clear_history(update, context, last_message_deletion=False)
+        next_state = await send_payment_invitation(update, context)
         return next_state
 
-    if update.callback_query.data == 'wrong_customer':
-        if context.chat_data['language'] == 'russian':
-            text = "Исправление данных:"
-        else:
-            text = "Correction of data:"
+    next_state = await send_delivery_methods_menu(update, context)
+    return next_state
 
-        message = await update.callback_query.edit_message_text(
-            text=text,
-            reply_markup=None,
-        )
-        add_message_to_history(context, message)
 
-        next_state = await send_customer_fullname_invitation(
-            update, context
-        )
-        return next_state
+async def handle_wrong_customer_button(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Handle correction of the customer fullname and phone number."""
+    text = get_catalog(context).texts['data_correction']
+
+    message = await edit_message_text(
+        update,
+        context,
+        text=text,
+        reply_markup=None,
+    )
+    add_message_to_history(context, message)
+
+    next_state = await send_customer_fullname_invitation(update, context)
+    return next_state
 
 
 async def handle_payment_screenshot(
@@ -470,13 +392,7 @@ async def handle_payment_screenshot(
     """Handle receipt of screenshot of payment."""
     add_message_to_history(context, update.message)
     if not update.message.photo:
-        if context.chat_data['language'] == 'russian':
-            text = 'Ты прислал не скриншот оплаты.\n\n'
-        else:
-            text = (
-                "You didn't send a screenshot "
-                "of the payment\n\n"
-            )
+        text = get_catalog(context).texts['not_payment_screenshot']
         next_state = await send_payment_invitation(update, context, text)
         return next_state
 
@@ -489,12 +405,12 @@ async def handle_payment_screenshot(
     await Database.create_order(
         chat_id=update.effective_chat['id'],
         tg_username=update.effective_chat['username'],
-        language=context.chat_data['language'],
-        customer_email=context.chat_data['customer_email'],
-        customer_fullname=context.chat_data['customer_fullname'],
-        customer_phone=context.chat_data['customer_phone'],
-        impression_id=context.chat_data['impression_id'],
-        recipient_name=context.chat_data['customer_fullname'],
+        language=context.chat_data.language,
+        customer_email=context.chat_data.customer_email,
+        customer_fullname=context.chat_data.customer_fullname,
+        customer_phone=context.chat_data.customer_phone,
+        impression_id=context.chat_data.impression_id,
+        recipient_name=context.chat_data.customer_fullname,
         recipient_contact='Получателем является заказчик',
         email_receiving=True,
         screenshot_stream=screenshot_stream
@@ -509,47 +425,48 @@ async def handle_dialogue_end(
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
     """Handle end of dialogue."""
-    if update.callback_query:
-        await update.callback_query.answer()
-        if update.callback_query.data == 'main_menu':
-            await clear_history(update, context, last_message_deletion=False)
-            next_state = await send_main_menu(update, context)
-            return next_state
     return 0
 
 
-async def handle_delivery_methods_menu(
+async def handle_back_to_main_menu_button(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    """Handle Delivery method menu."""
-    if not update.callback_query:
-        if context.chat_data['language'] == 'russian':
-            text = (
-                'Извини, непонятно, какой способ доставки ты хочешь выбрать. '
-                'Попробуй ещё раз.\n\n'
-            )
-        else:
-            text = (
-                "Sorry, it's not clear which delivery method you want "
-                "to choose. Try again.\n\n"
-            )
-        next_state = await send_delivery_methods_menu(update, context, text)
-        return next_state
+    """Handle Back to main menu button click after end of dialogue."""
+    clear_history(update, context, last_message_deletion=False)
+    next_state = await send_main_menu(update, context)
+    return next_state
 
-    await update.callback_query.answer()
 
-    context.chat_data['delivery_method'] = update.callback_query.data
-    if update.callback_query.data == 'courier_delivery':
-        await clear_history(update, context)
-        next_state = await send_recipient_name_invitation(
-            update, context
-        )
-        return next_state
+async def handle_unrecognized_delivery_method(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Handle Unrecognized delivery method."""
+    text = get_catalog(context).texts['unrecognized_delivery_method']
+    next_state = await send_delivery_methods_menu(update, context, text)
+    return next_state
 
-    if update.callback_query.data == 'self_delivery':
-        next_state = await send_self_delivery_menu(update, context)
-        return next_state
+
+async def handle_courier_delivery_button(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Handle Courier delivery button click."""
+    context.chat_data.delivery_method = 'courier_delivery'
+    clear_history(update, context)
+    next_state = await send_recipient_name_invitation(update, context)
+    return next_state
+
+
+async def handle_self_delivery_button(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Handle Self-delivery button click."""
+    context.chat_data.delivery_method = 'self_delivery'
+    next_state = await send_self_delivery_menu(update, context)
+    return next_state
 
 
 async def handle_recipient_name_message(
@@ -564,7 +481,7 @@ async def handle_recipient_name_message(
         next_state = await send_name_error_message(update, context)
         return next_state
 
-    context.chat_data['recipient_name'] = recipient_name
+    context.chat_data.recipient_name = recipient_name
     next_state = await send_recipient_contact_invitation(update, context)
     return next_state
 
@@ -578,98 +495,66 @@ async def handle_recipient_contact_message(
 
     recipient_contact = update.message.text.strip()
     if len(recipient_contact) < 3:
-        if context.chat_data['language'] == 'russian':
-            text = (
-                'Ошибка в присланных контактах.\nПожалуйста, '
-                'пришли нам номер в WhatsApp или ник в Telegram:'
-                )
-        else:
-            text = (
-                'Error in spelling of contacts.\nPlease '
-                'send us the number in WhatsApp or nickname in Telegram:'
-            )
+        text = get_catalog(context).texts['recipient_contact_error']
         message = await update.message.reply_text(text=text)
         add_message_to_history(context, update.message)
         return WAITING_RECIPIENT_CONTACT
 
-    context.chat_data['recipient_contact'] = recipient_contact
+    context.chat_data.recipient_contact = recipient_contact
     next_state = await send_recipient_confirmation_menu(update, context)
     return next_state
 
 
-async def handle_recipient_confirmation(
+async def handle_unrecognized_recipient_confirmation(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    """Handle the WAITING_RECIPIENT_CONFIRMATION state."""
-    if not update.callback_query:
-        await context.bot.delete_message(
-            update.effective_chat['id'],
-            update.message.message_id
-        )
-        await delete_last_history_message(update, context)
+    """Handle a message instead of the recipient confirmation."""
+    delete_last_history_message(update, context)
+    message_cleaner.schedule(context, [update.message.message_id])
 
-        if context.chat_data['language'] == 'russian':
-            text = (
-                "Извини, непонятно, подтверждаешь ли ты, что верно ввёл "
-                "имя и контакт получателя.\n"
-                "Нужно нажать на соответствующую кнопку.\n\n"
-            )
-        else:
-            text = (
-                "Sorry, it's not clear if you are confirming that you have "
-                "entered the recipient's name and contact correctly.\n"
-                "You need to click the appropriate button.\n\n"
-            )
-        next_state = await send_recipient_confirmation_menu(
-            update, context, text
-        )
-        return next_state
-
-    await update.callback_query.answer()
-
-    if update.callback_query.data == 'right_recipient':
-        await clear_history(update, context, last_message_deletion=False)
-        next_state = await send_successful_booking_menu(update, context)
-        return next_state
-
-    if update.callback_query.data == 'wrong_recipient':
-        if context.chat_data['language'] == 'russian':
-            text = "Исправление данных:"
-        else:
-            text = "Correction of data:"
+    text = get_catalog(context).texts['unrecognized_recipient_confirmation']
+    next_state = await send_recipient_confirmation_menu(update, context, text)
+    return next_state
 
-        message = await update.callback_query.edit_message_text(
-            text=text,
-            reply_markup=None,
-        )
-        add_message_to_history(context, message)
 
-        next_state = await send_recipient_name_invitation(
-            update, context
-        )
-        return next_state
+async def handle_right_recipient_button(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Handle confirmation of the recipient name and contact."""
+    clear_history(update, context, last_message_deletion=False)
+    next_state = await send_successful_booking_menu(update, context)
+    return next_state
 
 
-async def handle_self_delivery_menu(
+async def handle_wrong_recipient_button(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    """Handle Confirming self-delivery menu."""
-    if not update.callback_query:
-        text = get_misunderstanding_message(context.chat_data['language'])
-        next_state = await send_self_delivery_menu(update, context, text)
-        return next_state
+    """Handle correction of the recipient name and contact."""
+    text = get_catalog(context).texts['data_correction']
+
+    message = await edit_message_text(
+        update,
+        context,
+        text=text,
+        reply_markup=None,
+    )
+    add_message_to_history(context, message)
 
-    await update.callback_query.answer()
+    next_state = await send_recipient_name_invitation(update, context)
+    return next_state
 
-    if update.callback_query.data == 'self_delivery_yes':
-        next_state = await send_successful_booking_menu(update, context)
-        return next_state
 
-    if update.callback_query.data == 'self_delivery_no':
-        next_state = await send_delivery_methods_menu(update, context)
-        return next_state
+async def handle_unrecognized_self_delivery_answer(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Handle Unrecognized answer in Confirming self-delivery menu."""
+    text = get_catalog(context).texts['misunderstanding']
+    next_state = await send_self_delivery_menu(update, context, text)
+    return next_state
 
 
 async def handle_certificate_button(
@@ -677,17 +562,7 @@ async def handle_certificate_button(
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
     """Handle Activate certificate button click."""
-    if context.chat_data['language'] == 'russian':
-        text = (
-            'Поздравляем - близкий человек подарил тебе прекрасные '
-            'впечатления!\nОкунёмся в мир невероятных эмоций?\n\n'
-        )
-    else:
-        text = (
-            "Congratulations - a loved one has given you a wonderful "
-            "experience!\nLet's dive into the world of incredible "
-            "emotions?\n\n"
-        )
+    text = get_catalog(context).texts['certificate_greeting']
     next_state = await send_certificate_id_invitation(update, context, text)
     return next_state
 
@@ -703,7 +578,7 @@ async def handle_certificate_id_message(
     activation_results = await Database.activate_certificate(
         chat_id=update.effective_chat['id'],
         tg_username=update.effective_chat['username'],
-        language=context.chat_data['language'],
+        language=context.chat_data.language,
         certificate_id=certificate_id
     )
     if activation_results['availability']:
@@ -718,60 +593,196 @@ async def handle_certificate_id_message(
     return next_state
 
 
-async def handle_wrong_certificate_menu(
+async def handle_unrecognized_wrong_certificate_answer(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    """Handle Wrong certificate menu."""
-    if not update.callback_query:
-        text = get_misunderstanding_message(context.chat_data['language'])
-        next_state = await send_wrong_certificate_menu(update, context, text)
-        return next_state
+    """Handle Unrecognized answer in Wrong certificate menu."""
+    text = get_catalog(context).texts['misunderstanding']
+    next_state = await send_wrong_certificate_menu(update, context, text)
+    return next_state
 
-    await update.callback_query.answer()
 
-    if update.callback_query.data == 'certificate_id':
-        next_state = await send_certificate_id_invitation(update, context)
-        return next_state
+async def handle_activation_problem_button(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Handle Call person button click in Wrong certificate menu."""
+    context.chat_data.request_type = 'activation_problem'
+    next_state = await send_calling_person_menu(update, context)
+    return next_state
 
-    if update.callback_query.data == 'call_person':
-        context.chat_data['request_type'] = 'activation_problem'
-        next_state = await send_calling_person_menu(update, context)
-        return next_state
 
-    if update.callback_query.data == 'main_menu':
-        await clear_history(update, context, last_message_deletion=False)
-        next_state = await send_main_menu(update, context)
-        return next_state
+async def handle_unrecognized_question(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Handle Unrecognized question in FAQ menu."""
+    text = get_catalog(context).texts['unrecognized_question']
+
+    next_state = await send_faq_menu(update, context, text)
+    return next_state
 
 
-async def handle_faq_menu(
+async def handle_question_for_operator_button(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    """Handle Question selecting."""
-    if not update.callback_query:
-        if context.chat_data['language'] == 'russian':
-            text = (
-                'Извини, непонятно, что ты хочешь выбрать. '
-                'Нажми на кнопку.\n\n'
-            )
-        else:
-            text = (
-                "Sorry, it's not clear what you want to choose. "
-                "Click on the button.\n\n"
-            )
+    """Handle Call person button click in FAQ menu."""
+    context.chat_data.request_type = 'question_for_operator'
+    next_state = await send_calling_person_menu(update, context)
+    return next_state
 
-        next_state = await send_faq_menu(update, context, text)
-        return next_state
 
-    await update.callback_query.answer()
+async def handle_inline_query(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """Answer the inline query with the impressions found by name."""
+    language = get_language_by_code(
+        update.inline_query.from_user.language_code
+    )
+    impressions_catalog = impressions_cache.catalog
+    impressions = impressions_catalog.search(
+        language,
+        update.inline_query.query
+    )
+    results = [
+        InlineQueryResultArticle(
+            id=str(impression.id),
+            title=impression.name,
+            description=impression.price,
+            url=impression.url or None,
+            input_message_content=InputTextMessageContent(
+                f'{impression.name} - {impression.price}\n'
+                f'{impression.url}'.strip()
+            )
+        )
+        for impression in impressions
+    ]
+    await update.inline_query.answer(
+        results,
+        cache_time=IMPRESSIONS_CACHE_TTL
+    )
 
-    if update.callback_query.data == 'main_menu':
-        next_state = await send_main_menu(update, context)
-        return next_state
 
-    if update.callback_query.data == 'call_person':
-        context.chat_data['request_type'] = 'question_for_operator'
-        next_state = await send_calling_person_menu(update, context)
-        return next_state
+TRANSITIONS = compile_transitions({
+    START: {
+        MESSAGE: handle_start_command,
+        CALLBACK: {ANY: handle_start_command},
+    },
+    SELECTING_LANGUAGE: {
+        MESSAGE: handle_start_command,
+        CALLBACK: {
+            **dict.fromkeys(LANGUAGES, handle_language_button),
+        },
+    },
+    MAIN_MENU: {
+        MESSAGE: handle_unrecognized_main_menu_item,
+        CALLBACK: {
+            'impression': send_impressions_categories_menu,
+            'certificate': handle_certificate_button,
+            'faq': send_faq_menu,
+        },
+    },
+    SELECTING_IMPRESSIONS_CATEGORY: {
+        MESSAGE: handle_unrecognized_impressions_category,
+        CALLBACK: {
+            'main_menu': send_main_menu,
+            **dict.fromkeys(
+                CATEGORY_FIELDS, handle_impressions_category_button
+            ),
+            ANY: handle_unrecognized_impressions_category,
+        },
+    },
+    SELECTING_IMPRESSION: {
+        MESSAGE: handle_impression_number_message,
+        CALLBACK: {
+            'category_menu': send_impressions_categories_menu,
+            'impressions_next_page': handle_impressions_page_button,
+            'impressions_previous_page': handle_impressions_page_button,
+            ANY: handle_unrecognized_impression,
+        },
+    },
+    SELECTING_RECEIVING_METHOD: {
+        MESSAGE: handle_unrecognized_receiving_method,
+        CALLBACK: {
+            'main_menu': send_main_menu,
+            'impression': send_impressions_categories_menu,
+            'email': handle_email_button,
+            'gift_box': handle_giftbox_button,
+        },
+    },
+    WAITING_CUSTOMER_EMAIL: {
+        MESSAGE: handle_customer_email_message,
+    },
+    ACQUAINTED_PRIVACY_POLICY: {
+        MESSAGE: send_privacy_policy_menu,
+        CALLBACK: {ANY: handle_privacy_policy_button},
+    },
+    WAITING_CUSTOMER_FULLNAME: {
+        MESSAGE: handle_customer_fullname_message,
+    },
+    WAITING_CUSTOMER_PHONE: {
+        MESSAGE: handle_customer_phone_message,
+    },
+    WAITING_CUSTOMER_CONFIRMATION: {
+        MESSAGE: handle_unrecognized_customer_confirmation,
+        CALLBACK: {
+            'right_customer': handle_right_customer_button,
+            'wrong_customer': handle_wrong_customer_button,
+        },
+    },
+    WAITING_PAYMENT_SCREENSHOT: {
+        MESSAGE: handle_payment_screenshot,
+    },
+    DIALOGUE_END: {
+        MESSAGE: handle_dialogue_end,
+        CALLBACK: {'main_menu': handle_back_to_main_menu_button},
+    },
+    SELECTING_DELIVERY_METHOD: {
+        MESSAGE: handle_unrecognized_delivery_method,
+        CALLBACK: {
+            'courier_delivery': handle_courier_delivery_button,
+            'self_delivery': handle_self_delivery_button,
+        },
+    },
+    WAITING_RECIPIENT_NAME: {
+        MESSAGE: handle_recipient_name_message,
+    },
+    WAITING_RECIPIENT_CONTACT: {
+        MESSAGE: handle_recipient_contact_message,
+    },
+    WAITING_RECIPIENT_CONFIRMATION: {
+        MESSAGE: handle_unrecognized_recipient_confirmation,
+        CALLBACK: {
+            'right_recipient': handle_right_recipient_button,
+            'wrong_recipient': handle_wrong_recipient_button,
+        },
+    },
+    CONFIRMING_SELF_DELIVERY: {
+        MESSAGE: handle_unrecognized_self_delivery_answer,
+        CALLBACK: {
+            'self_delivery_yes': send_successful_booking_menu,
+            'self_delivery_no': send_delivery_methods_menu,
+        },
+    },
+    WAITING_CERTIFICATE_ID: {
+        MESSAGE: handle_certificate_id_message,
+    },
+    WRONG_CERTIFICATE_MENU: {
+        MESSAGE: handle_unrecognized_wrong_certificate_answer,
+        CALLBACK: {
+            'certificate_id': send_certificate_id_invitation,
+            'call_person': handle_activation_problem_button,
+            'main_menu': handle_back_to_main_menu_button,
+        },
+    },
+    SELECTING_QUESTION: {
+        MESSAGE: handle_unrecognized_question,
+        CALLBACK: {
+            'main_menu': send_main_menu,
+            'call_person': handle_question_for_operator_button,
+        },
+    },
+})
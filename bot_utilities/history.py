@@ -1,79 +1,350 @@
 # coding=utf-8
 """Saves and clears chat history in the wishlist-shop telegram bot."""
-from contextlib import suppress
+import asyncio
+import logging
+from collections import Counter, deque
+from typing import Iterable, Iterator, List, Optional, Set
 
 import telegram.error
-from telegram import Message, Update
-from telegram.ext import ContextTypes
+from telegram import Bot, Message, Update
+from telegram.ext import Application, ContextTypes
 
+MAX_HISTORY_LENGTH = 300
+MAX_DELETED_MESSAGES_PER_REQUEST = 100
+MAX_CONCURRENT_DELETION_REQUESTS = 4
 
-async def clear_history(
+logger = logging.getLogger(__name__)
+
+deletion_metrics = Counter()
+
+
+class MessagesHistory:
+    """Ids of chat messages to delete, stored as ranges of consecutive ids.
+
+    Appending takes O(1). When the history grows longer than max_length,
+    the oldest ids are dropped.
+    """
+
+    __slots__ = ('_ranges', '_size', 'max_length')
+
+    def __init__(
+        self,
+        message_ids: Iterable[int] = (),
+        max_length: int = MAX_HISTORY_LENGTH
+    ):
+        self._ranges = deque()
+        self._size = 0
+        self.max_length = max_length
+        for message_id in message_ids:
+            self.append(message_id)
+
+    @classmethod
+    def from_json(cls, data: Optional[List]) -> 'MessagesHistory':
+        """Restore the history from ranges or from a list of ids."""
+        history = cls()
+        for item in data or []:
+            if isinstance(item, int):
+                history.append(item)
+                continue
+            first_id, last_id = item
+            history._ranges.append([first_id, last_id])
+            history._size += last_id - first_id + 1
+        history._truncate()
+        return history
+
+    def to_json(self) -> List[List[int]]:
+        """Return the ranges of consecutive ids."""
+        return [list(ids_range) for ids_range in self._ranges]
+
+    @property
+    def first(self) -> Optional[int]:
+        """The oldest message id."""
+        return self._ranges[0][0] if self._ranges else None
+
+    @property
+    def last(self) -> Optional[int]:
+        """The newest message id."""
+        return self._ranges[-1][1] if self._ranges else None
+
+    def append(self, message_id: int) -> None:
+        """Add message id to the end of history if it isn't the last one."""
+        if self._ranges:
+            last_range = self._ranges[-1]
+            if message_id == last_range[1]:
+                return
+            if message_id == last_range[1] + 1:
+                last_range[1] = message_id
+                self._size += 1
+                self._truncate()
+                return
+
+        self._ranges.append([message_id, message_id])
+        self._size += 1
+        self._truncate()
+
+    def remove(self, message_ids: Iterable[int]) -> None:
+        """Remove message ids from history."""
+        removed_ids = set(message_ids)
+        if not removed_ids:
+            return
+        remaining_ids = [
+            message_id for message_id in self if message_id not in removed_ids
+        ]
+        self.clear()
+        for message_id in remaining_ids:
+            self.append(message_id)
+
+    def clear(self) -> None:
+        """Remove all message ids from history."""
+        self._ranges.clear()
+        self._size = 0
+
+    def _truncate(self) -> None:
+        while self._size > self.max_length:
+            first_range = self._ranges[0]
+            if first_range[0] == first_range[1]:
+                self._ranges.popleft()
+            else:
+                first_range[0] += 1
+            self._size -= 1
+
+    def __iter__(self) -> Iterator[int]:
+        for first_id, last_id in self._ranges:
+            yield from range(first_id, last_id + 1)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MessagesHistory):
+            return NotImplemented
+        return self._ranges == other._ranges
+
+    def __repr__(self) -> str:
+        return f'MessagesHistory({self.to_json()})'
+
+
+def get_messages_history(
+    context: ContextTypes.DEFAULT_TYPE
+) -> MessagesHistory:
+    """Return chat history."""
+    return context.chat_data.messages_history
+
+
+async def delete_message(
+    bot: Bot,
+    chat_id: int,
+    message_id: int,
+    semaphore: asyncio.Semaphore
+) -> bool:
+    """Delete a message, return False if it should be deleted later."""
+    async with semaphore:
+        deletion_metrics['requests'] += 1
+        try:
+            await bot.delete_message(chat_id, message_id)
+        except telegram.error.BadRequest as error:
+            deletion_metrics['failed'] += 1
+            logger.debug(
+                'Chat %s: message %s was not deleted: %s',
+                chat_id, message_id, error
+            )
+        except telegram.error.TelegramError as error:
+            deletion_metrics['postponed'] += 1
+            logger.debug(
+                'Chat %s: deletion of message %s is postponed: %s',
+                chat_id, message_id, error
+            )
+            return False
+        else:
+            deletion_metrics['deleted'] += 1
+    return True
+
+
+async def delete_messages_chunk(
+    bot: Bot,
+    chat_id: int,
+    message_ids: List[int],
+    semaphore: asyncio.Semaphore
+) -> List[int]:
+    """Delete a chunk of messages in one request.
+
+    If Telegram refuses to delete the chunk, its messages are deleted
+    one by one, so one message which can't be deleted doesn't keep
+    the others. Returns ids that shouldn't be deleted again.
+    """
+    if len(message_ids) == 1:
+        processed = await delete_message(
+            bot, chat_id, message_ids[0], semaphore
+        )
+        return message_ids if processed else []
+
+    async with semaphore:
+        deletion_metrics['requests'] += 1
+        try:
+            await bot.delete_messages(chat_id, message_ids)
+        except telegram.error.BadRequest as error:
+            logger.debug(
+                'Chat %s: %s messages are deleted one by one: %s',
+                chat_id, len(message_ids), error
+            )
+        except telegram.error.TelegramError as error:
+            deletion_metrics['postponed'] += len(message_ids)
+            logger.debug(
+                'Chat %s: deletion of %s messages is postponed: %s',
+                chat_id, len(message_ids), error
+            )
+            return []
+        else:
+            deletion_metrics['deleted'] += len(message_ids)
+            return message_ids
+
+    results = await asyncio.gather(*(
+        delete_message(bot, chat_id, message_id, semaphore)
+        for message_id in message_ids
+    ))
+    return [
+        message_id
+        for message_id, processed in zip(message_ids, results)
+        if processed
+    ]
+
+
+async def delete_messages(
+    bot: Bot,
+    chat_id: int,
+    message_ids: List[int]
+) -> List[int]:
+    """Delete messages from chat in concurrent requests of allowed size.
+
+    At most MAX_CONCURRENT_DELETION_REQUESTS requests are sent at once.
+    Returns ids that shouldn't be deleted again: the deleted ones and
+    the ones Telegram refused to delete. Ids of requests failed because
+    of network errors aren't returned, so they can be retried later.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DELETION_REQUESTS)
+    results = await asyncio.gather(*(
+        delete_messages_chunk(
+            bot,
+            chat_id,
+            message_ids[start:start + MAX_DELETED_MESSAGES_PER_REQUEST],
+            semaphore
+        )
+        for start in range(
+            0, len(message_ids), MAX_DELETED_MESSAGES_PER_REQUEST
+        )
+    ))
+    return [
+        message_id
+        for processed_ids in results
+        for message_id in processed_ids
+    ]
+
+
+class MessageCleaner:
+    """Delete chat messages in the background.
+
+    Message ids scheduled for a chat are kept in the persisted chat
+    session until Telegram deletes them, so they survive restarts.
+    They are deleted when the chat is flushed after the reply to
+    the user, so cleanup never delays the reply. Ids which couldn't be
+    deleted because of network errors are retried on the next flush.
+    """
+
+    def __init__(self):
+        self._flushing_chats: Set[int] = set()
+
+    def schedule(
+        self,
+        context: ContextTypes.DEFAULT_TYPE,
+        message_ids: Iterable[int]
+    ) -> None:
+        """Add message ids to the deletion queue of the chat."""
+        context.chat_data.pending_deletions.extend(message_ids)
+
+    def flush(self, application: Application, chat_id: int) -> None:
+        """Start deleting the pending messages of the chat."""
+        session = application.chat_data.get(chat_id)
+        if not session or not session.pending_deletions:
+            return
+        if chat_id in self._flushing_chats:
+            return
+
+        self._flushing_chats.add(chat_id)
+        application.create_task(self._delete_pending_messages(
+            application, chat_id
+        ))
+
+    async def _delete_pending_messages(
+        self,
+        application: Application,
+        chat_id: int
+    ) -> None:
+        session = application.chat_data[chat_id]
+        attempted_ids = set()
+        try:
+            while True:
+                message_ids = [
+                    message_id
+                    for message_id in session.pending_deletions
+                    if message_id not in attempted_ids
+                ]
+                if not message_ids:
+                    break
+
+                attempted_ids.update(message_ids)
+                processed_ids = set(await delete_messages(
+                    application.bot, chat_id, message_ids[::-1]
+                ))
+                session.pending_deletions = [
+                    message_id
+                    for message_id in session.pending_deletions
+                    if message_id not in processed_ids
+                ]
+                application.mark_data_for_update_persistence(
+                    chat_ids=chat_id
+                )
+        finally:
+            self._flushing_chats.discard(chat_id)
+
+
+message_cleaner = MessageCleaner()
+
+
+def clear_history(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
     first_message_deletion: bool = True,
     last_message_deletion: bool = True
 ) -> None:
-    """Delete messages from chat."""
-    messages_history = context.chat_data.get('messages_history', [])
+    """Remove messages from history and schedule their deletion."""
     if update.message:
-        if (
-            not messages_history or
-            messages_history[-1] != update.message.message_id
-        ):
-            messages_history.append(update.message.message_id)
-            context.chat_data['messages_history'] = messages_history[:]
-
-    last_message_id = -1
-    if messages_history and not last_message_deletion:
-        last_message_id = messages_history[-1]
-        messages_history = messages_history[:-1]
-
-    if not messages_history:
-        return
+        add_message_to_history(context, update.message)
 
-    if not first_message_deletion and len(messages_history) == 1:
+    messages_history = get_messages_history(context)
+    message_ids = list(messages_history)
+    if not last_message_deletion:
+        message_ids = message_ids[:-1]
+    if not first_message_deletion:
+        message_ids = message_ids[1:]
+    if not message_ids:
         return
 
-    if first_message_deletion:
-        with suppress(telegram.error.BadRequest):
-            success = await context.bot.delete_messages(
-                update.effective_chat['id'],
-                messages_history[::-1]
-            )
-            if success:
-                if last_message_deletion or last_message_id == -1:
-                    context.chat_data['messages_history'] = []
-                else:
-                    context.chat_data['messages_history'] = [last_message_id]
-        return
+    messages_history.remove(message_ids)
+    message_cleaner.schedule(context, message_ids)
 
-    first_message_id = messages_history[0]
-    messages_history = messages_history[1:]
-    with suppress(telegram.error.BadRequest):
-        success = await context.bot.delete_messages(
-            update.effective_chat['id'],
-            messages_history[::-1]
-        )
-        if success:
-            context.chat_data['messages_history'] = [first_message_id]
 
-
-async def delete_last_history_message(
+def delete_last_history_message(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
 ) -> None:
-    """Delete last history message from chat."""
-    messages_history = context.chat_data.get('messages_history', [])
-    if not messages_history:
+    """Remove last message from history and schedule its deletion."""
+    messages_history = get_messages_history(context)
+    last_message_id = messages_history.last
+    if last_message_id is None:
         return
 
-    with suppress(telegram.error.BadRequest):
-        success = await context.bot.delete_message(
-            update.effective_chat['id'],
-            messages_history[-1]
-        )
-        if success:
-            context.chat_data['messages_history'] = messages_history[:-1]
+    messages_history.remove([last_message_id])
+    message_cleaner.schedule(context, [last_message_id])
 
 
 def add_message_to_history(
@@ -84,11 +355,4 @@ def add_message_to_history(
     if not message:
         return
 
-    messages_history = context.chat_data.get('messages_history', [])
-    if (
-        not messages_history or
-        messages_history[-1] != message.message_id
-    ):
-        messages_history.append(message.message_id)
-        context.chat_data['messages_history'] = messages_history[:]
-        print(context.chat_data['messages_history'])
+    get_messages_history(context).append(message.message_id)
@@ -0,0 +1,316 @@
+# coding=utf-8
+"""Cache the impressions of the wishlist-shop telegram bot."""
+import asyncio
+import hashlib
+import json
+import os
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import django
+
+from .catalog import CATALOGS, DEFAULT_LANGUAGE
+from .session import ChatSession
+
+IMPRESSIONS_PAGE_SIZE = int(os.environ.get('IMPRESSIONS_PAGE_SIZE', 10))
+IMPRESSIONS_CACHE_TTL = int(os.environ.get('IMPRESSIONS_CACHE_TTL', 60))
+
+NGRAM_LENGTH = 3
+MAX_SEARCH_RESULTS = 20
+
+CATEGORY_FIELDS = {
+    'man': 'for_men',
+    'girl': 'for_girls',
+    'couple': 'for_couples',
+    'all': 'for_all',
+}
+
+# Name field, price field, currency and url field of each language.
+# Catalog languages without their fields use the default language ones.
+LANGUAGE_FIELDS = {
+    'russian': ('name', 'price_in_rubles', '₽', 'url_for_russians'),
+    'english': ('english_name', 'price_in_euros', '€', 'url_for_english'),
+}
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'impressions.settings')
+django.setup()
+
+from django.db import transaction  # noqa: E402
+from django.db.models.signals import post_delete, post_save  # noqa: E402
+
+from bot.database import Database  # noqa: E402
+from bot.models import Impression  # noqa: E402
+
+
+class CatalogImpression(NamedTuple):
+    """Impression translated to a language."""
+
+    id: int
+    position: int
+    name: str
+    price: str
+    url: str
+
+
+def get_rows_version(rows: List[Dict]) -> str:
+    """Return a hash which changes with the impressions."""
+    serialized_rows = json.dumps(rows, sort_keys=True, default=str)
+    return hashlib.blake2b(
+        serialized_rows.encode(), digest_size=8
+    ).hexdigest()
+
+
+def get_menu_version(impressions: Iterable['CatalogImpression']) -> str:
+    """Return a hash which changes when numbers mean other impressions."""
+    serialized_ids = ','.join(str(impression.id) for impression in impressions)
+    return hashlib.blake2b(
+        serialized_ids.encode(), digest_size=8
+    ).hexdigest()
+
+
+def normalise_search_text(text: str) -> str:
+    """Make the text case insensitive for search."""
+    return text.casefold().replace('ё', 'е')
+
+
+def get_ngrams(text: str) -> Set[str]:
+    """Return all the substrings of NGRAM_LENGTH characters."""
+    return {
+        text[start:start + NGRAM_LENGTH]
+        for start in range(len(text) - NGRAM_LENGTH + 1)
+    }
+
+
+class ImpressionsIndex:
+    """Find impressions by any part of their names.
+
+    Queries of NGRAM_LENGTH characters or longer are looked up in
+    the n-gram index, shorter ones in the index of word prefixes.
+    Returned positions are ordered by the impressions number,
+    impressions with a word starting with the query go first.
+    """
+
+    __slots__ = ('_texts', '_ngrams', '_prefixes')
+
+    def __init__(self, texts: Iterable[str]):
+        self._texts = tuple(normalise_search_text(text) for text in texts)
+        ngrams = defaultdict(list)
+        prefixes = defaultdict(list)
+        for position, text in enumerate(self._texts):
+            for ngram in get_ngrams(text):
+                ngrams[ngram].append(position)
+            text_prefixes = {
+                word[:length]
+                for word in text.split()
+                for length in range(1, NGRAM_LENGTH)
+            }
+            for prefix in text_prefixes:
+                prefixes[prefix].append(position)
+        self._ngrams = {
+            ngram: frozenset(positions) for ngram, positions in ngrams.items()
+        }
+        self._prefixes = {
+            prefix: tuple(positions)
+            for prefix, positions in prefixes.items()
+        }
+
+    def search(self, query: str) -> List[int]:
+        """Return the positions of the texts containing the query."""
+        query = normalise_search_text(query).strip()
+        if not query:
+            return list(range(len(self._texts)))
+        if len(query) < NGRAM_LENGTH:
+            return list(self._prefixes.get(query, ()))
+
+        postings = sorted(
+            (
+                self._ngrams.get(ngram, frozenset())
+                for ngram in get_ngrams(query)
+            ),
+            key=len
+        )
+        positions = postings[0].intersection(*postings[1:])
+        found_positions = [
+            position for position in positions
+            if query in self._texts[position]
+        ]
+        found_positions.sort(
+            key=lambda position: (
+                not any(
+                    word.startswith(query)
+                    for word in self._texts[position].split()
+                ),
+                position
+            )
+        )
+        return found_positions
+
+
+class ImpressionsCatalog:
+    """Impressions of every category in every language."""
+
+    __slots__ = (
+        'version', '_impressions', '_impressions_by_id', '_menu_versions',
+        '_search_index'
+    )
+
+    def __init__(self, rows: List[Dict], version: str):
+        self.version = version
+        self._impressions: Dict[Tuple[str, Optional[str]], Tuple] = {}
+        for language in CATALOGS:
+            name_field, price_field, currency, url_field = (
+                LANGUAGE_FIELDS.get(language)
+                or LANGUAGE_FIELDS[DEFAULT_LANGUAGE]
+            )
+            categories_rows = {
+                category: [row for row in rows if row[category_field]]
+                for category, category_field in CATEGORY_FIELDS.items()
+            }
+            # Impressions of all the categories for search.
+            categories_rows[None] = rows
+            for category, category_rows in categories_rows.items():
+                self._impressions[(language, category)] = tuple(
+                    CatalogImpression(
+                        id=row['id'],
+                        position=position,
+                        name=row[name_field],
+                        price=f'{row[price_field]} {currency}',
+                        url=row[url_field]
+                    )
+                    for position, row in enumerate(category_rows, 1)
+                )
+        self._impressions_by_id = {
+            (language, impression.id): impression
+            for language in CATALOGS
+            for impression in self._impressions[(language, None)]
+        }
+        self._menu_versions = {
+            key: get_menu_version(impressions)
+            for key, impressions in self._impressions.items()
+        }
+        self._search_index = ImpressionsIndex(
+            f"{row['name']} {row['english_name']}" for row in rows
+        )
+
+    def get_impressions(
+        self,
+        language: str,
+        category: str
+    ) -> Tuple[CatalogImpression, ...]:
+        """Return the impressions of the category."""
+        return self._impressions.get((language, category), ())
+
+    def get_impression(
+        self,
+        language: str,
+        impression_id: int
+    ) -> Optional[CatalogImpression]:
+        """Return the impression if it is still in the catalog."""
+        return self._impressions_by_id.get((language, impression_id))
+
+    def get_menu_version(self, language: str, category: str) -> str:
+        """Return the version of the numbers of the category menu.
+
+        It changes only when a number of the menu starts to mean another
+        impression, not when the impressions are edited.
+        """
+        return self._menu_versions.get((language, category), '')
+
+    def get_pages_count(
+        self,
+        language: str,
+        category: str,
+        page_size: int = IMPRESSIONS_PAGE_SIZE
+    ) -> int:
+        """Return the number of pages of the category."""
+        impressions = self.get_impressions(language, category)
+        return -(-len(impressions) // page_size)
+
+    def get_page(
+        self,
+        language: str,
+        category: str,
+        page: int,
+        page_size: int = IMPRESSIONS_PAGE_SIZE
+    ) -> Tuple[CatalogImpression, ...]:
+        """Return the impressions of the category page."""
+        impressions = self.get_impressions(language, category)
+        return impressions[page * page_size:(page + 1) * page_size]
+
+    def search(
+        self,
+        language: str,
+        query: str,
+        limit: int = MAX_SEARCH_RESULTS
+    ) -> List[CatalogImpression]:
+        """Return the impressions with the query in their names."""
+        impressions = self.get_impressions(language, None)
+        return [
+            impressions[position]
+            for position in self._search_index.search(query)[:limit]
+        ]
+
+
+class ImpressionsCache:
+    """Keep the catalog built in the background for the handlers.
+
+    Handlers only read the catalog, it is rebuilt by refresh, so they
+    never wait for the database. The catalog is rebuilt only if
+    the impressions have changed, so its version stays the same while
+    the impressions are the same.
+    """
+
+    __slots__ = ('catalog', '_lock', '_loop')
+
+    def __init__(self):
+        self.catalog = ImpressionsCatalog([], '')
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def refresh(self) -> None:
+        """Reload the impressions and rebuild the catalog if they changed."""
+        if not self._lock:
+            self._lock = asyncio.Lock()
+            self._loop = asyncio.get_running_loop()
+        async with self._lock:
+            rows = await Database.get_impressions_catalog()
+            version = get_rows_version(rows)
+            if self.catalog.version != version:
+                self.catalog = ImpressionsCatalog(rows, version)
+
+    def refresh_soon(self) -> None:
+        """Refresh the catalog in the event loop of the bot, if it runs.
+
+        Can be called from any thread, e.g. from the admin.
+        """
+        if self._loop and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.refresh(), self._loop)
+
+
+impressions_cache = ImpressionsCache()
+
+
+def refresh_impressions_cache(sender, **kwargs) -> None:
+    """Rebuild the catalog after an impression is changed in this process.
+
+    In webhook mode the admin runs in the bot process, so changes made
+    in the admin are shown at once instead of after IMPRESSIONS_CACHE_TTL.
+    """
+    transaction.on_commit(impressions_cache.refresh_soon)
+
+
+post_save.connect(
+    refresh_impressions_cache,
+    sender=Impression,
+    dispatch_uid='refresh_impressions_cache_on_save'
+)
+post_delete.connect(
+    refresh_impressions_cache,
+    sender=Impression,
+    dispatch_uid='refresh_impressions_cache_on_delete'
+)
+
+
+def get_impressions_menu(session: ChatSession) -> List:
+    """Return the category, the page and the version of the menu."""
+    return session.impressions_menu or ['all', 0, None]
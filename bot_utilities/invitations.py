@@ -6,8 +6,13 @@ import django
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from .catalog import get_catalog
 from .history import add_message_to_history
-from .messages import normalise_markdown_text, send_message
+from .messages import (
+    edit_message_text,
+    normalise_markdown_text,
+    send_message
+)
 from .states import (
     WAITING_CERTIFICATE_ID, WAITING_CUSTOMER_PHONE, WAITING_CUSTOMER_FULLNAME,
     WAITING_PAYMENT_SCREENSHOT, WAITING_RECIPIENT_CONTACT,
@@ -25,10 +30,7 @@ async def send_customer_fullname_invitation(
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
     """Send invitation to customer to enter their full name."""
-    if context.chat_data['language'] == 'russian':
-        text = 'Введи, пожалуйста, свои фамилию и имя (кириллицей):'
-    else:
-        text = 'Please write your first and last name:'
+    text = get_catalog(context).texts['customer_fullname_invitation']
 
     message = await context.bot.send_message(
         chat_id=update.effective_chat['id'],
@@ -43,10 +45,7 @@ async def send_customer_phone_invitation(
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
     """Send to the chat Request to enter the customer phone number."""
-    if context.chat_data['language'] == 'russian':
-        text = 'Оставь, пожалуйста, свой контактный номер телефона:'
-    else:
-        text = 'Please write your contact phone number:'
+    text = get_catalog(context).texts['customer_phone_invitation']
 
     message = await update.message.reply_text(text=text)
     add_message_to_history(context, message)
@@ -60,23 +59,15 @@ async def send_payment_invitation(
 ) -> int:
     """Send Payment details and wait for payment screenshot."""
     payment_details = await Database.get_payment_details(
-        context.chat_data['language']
+        context.chat_data.language
     )
     payment_details = normalise_markdown_text(payment_details)
-    if context.chat_data['language'] == 'russian':
-        text = normalise_markdown_text(
-            f'{text}Оплатить покупку можно по указанным реквизитам:\n\n*' +
-            payment_details +
-            '\n\n*После оплаты отправь нам скриншот с подтверждением оплаты:'
-        )
-    else:
-        text = normalise_markdown_text(
-            f"{text}"
-            "You can pay for the purchase by the specified details:\n\n*" +
-            payment_details +
-            "\n\n*After payment, send us a screenshot with payment:"
-            "confirmation"
+    text = normalise_markdown_text(
+        get_catalog(context).texts['payment_invitation'].format(
+            text=text,
+            payment_details=payment_details
         )
+    )
 
     message = await send_message(
         update, context, text, parse_mode='MarkdownV2'
@@ -90,10 +81,7 @@ async def send_recipient_name_invitation(
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
     """Handle Courier delivery button click."""
-    if context.chat_data['language'] == 'russian':
-        text = 'Введи имя получателя (кириллицей):'
-    else:
-        text = 'Please write the recipient name:'
+    text = get_catalog(context).texts['recipient_name_invitation']
 
     # message = await update.callback_query.edit_message_text(text=text)
     message = await context.bot.send_message(
@@ -109,16 +97,7 @@ async def send_recipient_contact_invitation(
     context: ContextTypes.DEFAULT_TYPE
 ) -> int:
     """Send to chat Request recipient's contact."""
-    if context.chat_data['language'] == 'russian':
-        text = (
-            'Как нам связаться с получателем?\n\n'
-            'Напиши номер в WhatsApp или ник в Telegram:'
-        )
-    else:
-        text = (
-            'How do we contact the recipient?\n\n'
-            'Write the number in WhatsApp or nickname in Telegram:'
-        )
+    text = get_catalog(context).texts['recipient_contact_invitation']
     message = await update.message.reply_text(text=text)
     add_message_to_history(context, message)
     return WAITING_RECIPIENT_CONTACT
@@ -130,9 +109,8 @@ async def send_certificate_id_invitation(
     text: str = ''
 ) -> int:
     """Send certificate ID input request to chat."""
-    if context.chat_data['language'] == 'russian':
-        text = f'{text}Введи ID сертификата, чтобы активировать его:'
-    else:
-        text = f"{text}Write your certificate ID to activate it:"
-    await update.callback_query.edit_message_text(text=text)
+    text = get_catalog(context).texts['certificate_id_invitation'].format(
+        text=text
+    )
+    await edit_message_text(update, context, text=text)
     return WAITING_CERTIFICATE_ID
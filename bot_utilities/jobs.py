@@ -0,0 +1,332 @@
+# coding=utf-8
+"""Run periodic jobs of the wishlist-shop telegram bot."""
+import asyncio
+import logging
+import os
+import time
+from contextlib import AsyncExitStack
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+import django
+import telegram.error
+from telegram import Bot
+from telegram.constants import MessageLimit
+from telegram.ext import ContextTypes, JobQueue
+
+from .catalog import CATALOGS, DEFAULT_LANGUAGE
+from .impressions import IMPRESSIONS_CACHE_TTL, impressions_cache
+from .outbound import BULK_PRIORITY
+from .session import get_language
+from .states import CONFIRMING_SELF_DELIVERY, WAITING_PAYMENT_SCREENSHOT
+
+CHAT_IDLE_TTL = int(os.environ.get('CHAT_IDLE_TTL', 7 * 24 * 60 * 60))
+IDLE_CHATS_SWEEP_INTERVAL = int(
+    os.environ.get('IDLE_CHATS_SWEEP_INTERVAL', 60 * 60)
+)
+IDLE_CHATS_BATCH_SIZE = int(os.environ.get('IDLE_CHATS_BATCH_SIZE', 500))
+IDLE_CHATS_MAX_BATCHES = 10
+
+CHECKOUT_STATES = [WAITING_PAYMENT_SCREENSHOT, CONFIRMING_SELF_DELIVERY]
+CHECKOUT_REMINDER_DELAY = int(
+    os.environ.get('CHECKOUT_REMINDER_DELAY', 24 * 60 * 60)
+)
+CHECKOUT_REMINDERS_INTERVAL = int(
+    os.environ.get('CHECKOUT_REMINDERS_INTERVAL', 15 * 60)
+)
+CHECKOUT_REMINDERS_BATCH_SIZE = int(
+    os.environ.get('CHECKOUT_REMINDERS_BATCH_SIZE', 100)
+)
+CHECKOUT_REMINDERS_MAX_BATCHES = 10
+
+BROADCASTS_INTERVAL = int(os.environ.get('BROADCASTS_INTERVAL', 60))
+BROADCAST_BATCH_SIZE = int(os.environ.get('BROADCAST_BATCH_SIZE', 100))
+BROADCAST_MAX_BATCHES = 10
+BROADCAST_PENDING_TIMEOUT = int(
+    os.environ.get('BROADCAST_PENDING_TIMEOUT', 60 * 60)
+)
+
+OUTBOX_INTERVAL = int(os.environ.get('OUTBOX_INTERVAL', 10))
+OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 100))
+DIGEST_SEPARATOR = '\n\n'
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'impressions.settings')
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+
+from bot.database import Database  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+async def expire_idle_chats(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Drop the chats idle for longer than CHAT_IDLE_TTL from memory.
+
+    The sessions stay in ChatData and are read again on the next update
+    of the chat, so the dialogue goes on where it stopped. The chats are
+    locked like their updates while their last changes are saved and
+    they are dropped. Chats still deleting messages are kept in memory.
+    At most IDLE_CHATS_MAX_BATCHES batches are dropped per run, the rest
+    of the idle chats wait for the next run.
+    """
+    application = context.application
+    idle_since = timezone.now() - timedelta(seconds=CHAT_IDLE_TTL)
+    dropped_chats_count = 0
+    skipped_ids = []
+    for _ in range(IDLE_CHATS_MAX_BATCHES):
+        chats_ids = await Database.get_idle_chats(
+            idle_since,
+            IDLE_CHATS_BATCH_SIZE,
+            skipped_ids
+        )
+        async with AsyncExitStack() as stack:
+            for chat_id in chats_ids:
+                await stack.enter_async_context(
+                    application.update_processor.lock_chat(chat_id)
+                )
+            # Changes of dropped chats are never saved, so save them now.
+            await application.update_persistence()
+            for chat_id in chats_ids:
+                session = application.chat_data.get(chat_id)
+                if session and session.pending_deletions:
+                    skipped_ids.append(chat_id)
+                    continue
+                application.drop_chat_data(chat_id)
+                dropped_chats_count += 1
+            # Drop the chats from the persistence before their next updates.
+            await application.update_persistence()
+        if len(chats_ids) < IDLE_CHATS_BATCH_SIZE:
+            break
+
+    if dropped_chats_count:
+        logger.info('Dropped %s idle chats from memory', dropped_chats_count)
+
+
+async def refresh_impressions_catalog(
+    context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """Rebuild the impressions catalog if the impressions have changed."""
+    await impressions_cache.refresh()
+
+
+async def send_checkout_reminder(
+    bot: Bot,
+    chat_id: int,
+    language_id: Optional[int]
+) -> bool:
+    """Send the checkout reminder, return False if it wasn't delivered."""
+    language = (
+        get_language(language_id).name.lower()
+        if language_id
+        else DEFAULT_LANGUAGE
+    )
+    try:
+        await bot.send_message(
+            chat_id=chat_id,
+            text=CATALOGS[language].texts['checkout_reminder'],
+            rate_limit_args=BULK_PRIORITY
+        )
+    except telegram.error.Forbidden:
+        return False
+    except telegram.error.TelegramError:
+        logger.exception('Failed to remind chat %s of checkout', chat_id)
+        return False
+    return True
+
+
+async def remind_abandoned_checkouts(
+    context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """Remind the chats stopped at checkout to finish the order.
+
+    Every stop at checkout is reminded at most once: chats are marked
+    as reminded before the reminders are sent. Reminders are sent with
+    the bulk priority, so they never delay replies to users.
+    """
+    idle_since = timezone.now() - timedelta(seconds=CHECKOUT_REMINDER_DELAY)
+    sent_count = 0
+    failed_count = 0
+    started_at = time.monotonic()
+    for _ in range(CHECKOUT_REMINDERS_MAX_BATCHES):
+        chats = await Database.claim_abandoned_chats(
+            CHECKOUT_STATES,
+            idle_since,
+            CHECKOUT_REMINDERS_BATCH_SIZE
+        )
+        results = await asyncio.gather(*(
+            send_checkout_reminder(context.bot, chat_id, language_id)
+            for chat_id, language_id in chats
+        ))
+        sent_count += sum(results)
+        failed_count += len(results) - sum(results)
+        if len(chats) < CHECKOUT_REMINDERS_BATCH_SIZE:
+            break
+
+    if sent_count or failed_count:
+        seconds = time.monotonic() - started_at
+        logger.info(
+            'Sent %s checkout reminders, %s failed, in %.1f s, '
+            '%.1f reminders per second',
+            sent_count,
+            failed_count,
+            seconds,
+            sent_count / max(seconds, 1e-3)
+        )
+
+
+async def send_broadcast_message(
+    bot: Bot,
+    chat_id: int,
+    text: str
+) -> Tuple[int, Optional[int], str]:
+    """Send the broadcast message, return its id or the error."""
+    try:
+        message = await bot.send_message(
+            chat_id=chat_id,
+            text=text,
+            rate_limit_args=BULK_PRIORITY
+        )
+    except telegram.error.TelegramError as error:
+        return chat_id, None, str(error)
+    return chat_id, message.message_id, ''
+
+
+async def send_broadcasts(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Send the unfinished broadcasts to the next chats.
+
+    Chats are reserved batch by batch before the messages are sent, so
+    after a restart the broadcast goes on from the next chats and
+    delivery is at-most-once. Deliveries left pending for longer than
+    BROADCAST_PENDING_TIMEOUT, e.g. by a restart while sending, are
+    reported as unconfirmed. Messages are sent with the bulk priority
+    within the global rate limits.
+    """
+    stale_count = await Database.mark_stale_broadcast_deliveries(
+        timezone.now() - timedelta(seconds=BROADCAST_PENDING_TIMEOUT)
+    )
+    if stale_count:
+        logger.warning(
+            '%s broadcast messages may not have been sent, '
+            'they are marked as unconfirmed',
+            stale_count
+        )
+
+    sent_count = 0
+    failed_count = 0
+    started_at = time.monotonic()
+    for _ in range(BROADCAST_MAX_BATCHES):
+        batch = await Database.get_broadcast_batch(BROADCAST_BATCH_SIZE)
+        if not batch:
+            break
+
+        results = await asyncio.gather(*(
+            send_broadcast_message(context.bot, chat_id, text)
+            for chat_id, text in batch['messages']
+        ))
+        await Database.save_broadcast_deliveries(
+            batch['broadcast_id'],
+            results
+        )
+        batch_sent_count = sum(1 for _, message_id, _ in results if message_id)
+        sent_count += batch_sent_count
+        failed_count += len(results) - batch_sent_count
+
+    if sent_count or failed_count:
+        seconds = time.monotonic() - started_at
+        logger.info(
+            'Sent %s broadcast messages, %s failed, in %.1f s, '
+            '%.1f messages per second',
+            sent_count,
+            failed_count,
+            seconds,
+            sent_count / max(seconds, 1e-3)
+        )
+
+
+def get_outbox_digests(
+    messages: List[Dict]
+) -> List[Tuple[int, List[int], str]]:
+    """Join the messages to the same chat into digests.
+
+    Every digest fits into one Telegram message. Returns the chat id,
+    the ids of the joined messages and the text of every digest.
+    """
+    chats_digests = {}
+    for message in messages:
+        text = message['text'][:MessageLimit.MAX_TEXT_LENGTH]
+        digests = chats_digests.setdefault(message['chat_id'], [])
+        if digests:
+            digest_text = digests[-1][1] + DIGEST_SEPARATOR + text
+            if len(digest_text) <= MessageLimit.MAX_TEXT_LENGTH:
+                digests[-1][0].append(message['id'])
+                digests[-1][1] = digest_text
+                continue
+        digests.append([[message['id']], text])
+
+    return [
+        (chat_id, messages_ids, text)
+        for chat_id, digests in chats_digests.items()
+        for messages_ids, text in digests
+    ]
+
+
+async def send_outbox_messages(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Send the Outbox messages, the messages to one chat in digests.
+
+    Messages are sent with the bulk priority, after replies to users.
+    Messages rejected by Telegram are marked as failed, the ones not
+    sent because of network errors are sent on the next run.
+    """
+    messages = await Database.get_outbox_messages(OUTBOX_BATCH_SIZE)
+    for chat_id, messages_ids, text in get_outbox_digests(messages):
+        try:
+            await context.bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                rate_limit_args=BULK_PRIORITY
+            )
+        except (telegram.error.BadRequest, telegram.error.Forbidden) as error:
+            await Database.mark_outbox_messages_processed(
+                messages_ids,
+                error=str(error)
+            )
+        except telegram.error.TelegramError:
+            logger.exception('Failed to send Outbox messages to %s', chat_id)
+        else:
+            await Database.mark_outbox_messages_processed(messages_ids)
+
+
+def schedule_jobs(job_queue: JobQueue) -> None:
+    """Add the periodic jobs to the job queue."""
+    job_queue.run_repeating(
+        refresh_impressions_catalog,
+        interval=IMPRESSIONS_CACHE_TTL,
+        first=IMPRESSIONS_CACHE_TTL,
+        name='refresh_impressions_catalog'
+    )
+    if CHAT_IDLE_TTL:
+        job_queue.run_repeating(
+            expire_idle_chats,
+            interval=IDLE_CHATS_SWEEP_INTERVAL,
+            first=IDLE_CHATS_SWEEP_INTERVAL,
+            name='expire_idle_chats'
+        )
+    job_queue.run_repeating(
+        remind_abandoned_checkouts,
+        interval=CHECKOUT_REMINDERS_INTERVAL,
+        first=CHECKOUT_REMINDERS_INTERVAL,
+        name='remind_abandoned_checkouts'
+    )
+    job_queue.run_repeating(
+        send_broadcasts,
+        interval=BROADCASTS_INTERVAL,
+        first=BROADCASTS_INTERVAL,
+        name='send_broadcasts'
+    )
+    job_queue.run_repeating(
+        send_outbox_messages,
+        interval=OUTBOX_INTERVAL,
+        first=OUTBOX_INTERVAL,
+        name='send_outbox_messages'
+    )
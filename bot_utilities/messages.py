@@ -1,5 +1,12 @@
 # coding=utf-8
 """Perform actions with chat messages in the wishlist-shop telegram bot."""
+import hashlib
+import json
+from collections import Counter
+from contextlib import suppress
+from typing import Optional
+
+import telegram.error
 from telegram import (
     InlineKeyboardMarkup,
     Message,
@@ -7,7 +14,96 @@ from telegram import (
 )
 from telegram.ext import ContextTypes
 
-from .history import clear_history
+from .history import clear_history, get_messages_history
+
+
+MAX_RENDERED_MESSAGES = 10
+
+edit_metrics = Counter()
+
+
+def get_content_hash(
+    text: str,
+    reply_markup: Optional[InlineKeyboardMarkup],
+    parse_mode: Optional[str]
+) -> str:
+    """Return a stable hash of the message content."""
+    content = [
+        text,
+        reply_markup.to_dict() if reply_markup else None,
+        parse_mode
+    ]
+    serialized_content = json.dumps(
+        content, ensure_ascii=False, sort_keys=True
+    )
+    return hashlib.blake2b(
+        serialized_content.encode(), digest_size=8
+    ).hexdigest()
+
+
+def remember_content_hash(
+    context: ContextTypes.DEFAULT_TYPE,
+    message_id: int,
+    content_hash: str
+) -> None:
+    """Save the hash of the content rendered in the message."""
+    rendered_messages = context.chat_data.rendered_messages
+    rendered_messages.pop(str(message_id), None)
+    rendered_messages[str(message_id)] = content_hash
+    while len(rendered_messages) > MAX_RENDERED_MESSAGES:
+        del rendered_messages[next(iter(rendered_messages))]
+
+
+async def edit_message_text(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    text: str,
+    reply_markup: InlineKeyboardMarkup = None,
+    parse_mode: str = None,
+    message_id: int = None
+) -> Optional[Message]:
+    """Edit the message unless it already has the same content.
+
+    Edits the message of the callback query if message_id is not set.
+    Returns None if the edit was skipped.
+    """
+    callback_query_edit = message_id is None
+    if callback_query_edit and update.callback_query.message:
+        message_id = update.callback_query.message.message_id
+
+    content_hash = get_content_hash(text, reply_markup, parse_mode)
+    rendered_messages = context.chat_data.rendered_messages
+    if message_id and rendered_messages.get(str(message_id)) == content_hash:
+        edit_metrics['skipped'] += 1
+        return None
+
+    edit_metrics['edits'] += 1
+    try:
+        if callback_query_edit:
+            message = await update.callback_query.edit_message_text(
+                text=text,
+                reply_markup=reply_markup,
+                parse_mode=parse_mode,
+                disable_web_page_preview=True
+            )
+        else:
+            message = await context.bot.edit_message_text(
+                text=text,
+                chat_id=update.effective_chat['id'],
+                message_id=message_id,
+                reply_markup=reply_markup,
+                parse_mode=parse_mode,
+                disable_web_page_preview=True
+            )
+    except telegram.error.BadRequest as error:
+        if 'message is not modified' not in error.message.lower():
+            raise
+        edit_metrics['not_modified'] += 1
+        message = None
+
+    if message_id:
+        remember_content_hash(context, message_id, content_hash)
+    return message
 
 
 async def send_message(
@@ -16,30 +112,32 @@ async def send_message(
     text: str,
     reply_markup: InlineKeyboardMarkup = None,
     parse_mode: str = None
-) -> Message:
+) -> Optional[Message]:
     """Send a menu to chat."""
     if update.callback_query:
-        message = await update.callback_query.edit_message_text(
-            text=text,
+        message = await edit_message_text(
+            update,
+            context,
+            text,
             reply_markup=reply_markup,
-            parse_mode=parse_mode,
-            disable_web_page_preview=True
+            parse_mode=parse_mode
         )
         return message
 
-    await clear_history(update, context, first_message_deletion=False)
-    messages_history = context.chat_data.get('messages_history', [])
+    messages_history = get_messages_history(context)
     if messages_history:
-        message = await context.bot.edit_message_text(
-            text=text,
-            chat_id=update.effective_chat['id'],
-            message_id=messages_history[0],
+        clear_history(update, context, first_message_deletion=False)
+        message = await edit_message_text(
+            update,
+            context,
+            text,
             reply_markup=reply_markup,
             parse_mode=parse_mode,
-            disable_web_page_preview=True
+            message_id=messages_history.first
         )
         return message
 
+    clear_history(update, context, first_message_deletion=False)
     message = await update.message.reply_text(
         text=text,
         reply_markup=reply_markup,
@@ -47,23 +145,20 @@ async def send_message(
         disable_web_page_preview=True
     )
     if message:
-        context.chat_data['messages_history'] = [message.message_id]
+        messages_history.clear()
+        messages_history.append(message.message_id)
+        remember_content_hash(
+            context,
+            message.message_id,
+            get_content_hash(text, reply_markup, parse_mode)
+        )
     return message
 
 
-def get_misunderstanding_message(language: str) -> str:
-    """Returns a message that the user action is not clear"""
-    if language == 'russian':
-        text = (
-            'Извини, непонятно, что ты хочешь выбрать. '
-            'Попробуй ещё раз.\n\n'
-        )
-    else:
-        text = (
-            "Sorry, it's not clear what you want to choose. "
-            "Try again.\n\n"
-        )
-    return text
+async def answer_callback_query(update: Update) -> None:
+    """Answer the callback query if Telegram still waits for the answer."""
+    with suppress(telegram.error.BadRequest):
+        await update.callback_query.answer()
 
 
 def normalise_markdown_text(text: str) -> str:
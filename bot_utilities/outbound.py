@@ -0,0 +1,229 @@
+# coding=utf-8
+"""Schedule outbound requests of the wishlist-shop telegram bot."""
+import asyncio
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Union
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+USER_REPLY_PRIORITY = 0
+CLEANUP_PRIORITY = 1
+BULK_PRIORITY = 2
+
+CLEANUP_ENDPOINTS = {'deleteMessage', 'deleteMessages'}
+EDIT_ENDPOINTS = {
+    'editMessageText', 'editMessageCaption', 'editMessageMedia',
+    'editMessageReplyMarkup'
+}
+
+MAX_CHAT_BUCKETS = 10000
+
+logger = logging.getLogger(__name__)
+
+JSONResult = Union[bool, Dict[str, Any], List[Dict[str, Any]]]
+
+
+class TokenBucket:
+    """Allow `rate` requests per second with bursts up to `capacity`."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated_at')
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def get_delay(self) -> float:
+        """Return seconds to wait until a request is allowed."""
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self) -> None:
+        """Take a token for a request."""
+        self.tokens -= 1
+
+
+def has_waiting_before(waiting: Optional[Counter], priority: int) -> bool:
+    """Return True if requests with a lower priority value are waiting."""
+    return any(
+        count
+        for waiting_priority, count in (waiting or {}).items()
+        if waiting_priority < priority
+    )
+
+
+class OutboundScheduler(BaseRateLimiter[int]):
+    """Spread requests to chats over time to stay within Telegram limits.
+
+    Requests to chats pass a global token bucket and a bucket of
+    their chat. When a bucket is exhausted, requests with a lower
+    priority value go first: user replies, then cleanup deletions,
+    then bulk sending. The priority is taken from rate_limit_args or
+    from the endpoint. Deletions and edits in private chats don't send
+    new messages, so they skip the bucket of the chat. Requests without
+    chat_id, e.g. answers to callback queries, are not throttled.
+
+    Buckets of at most MAX_CHAT_BUCKETS chats are kept, the bucket of
+    the chat with the oldest request is dropped first.
+
+    On RetryAfter all requests are paused for the time Telegram asks,
+    and the request is retried up to max_retries times.
+    """
+
+    __slots__ = (
+        '_global_bucket', '_chat_buckets', 'chat_rate', 'chat_capacity',
+        '_paused_until', '_waiting', '_chat_waiting', 'max_retries',
+        'metrics'
+    )
+
+    def __init__(
+        self,
+        global_rate: float = 30,
+        chat_rate: float = 1,
+        chat_capacity: float = 5,
+        max_retries: int = 3
+    ):
+        self._global_bucket = TokenBucket(global_rate, global_rate)
+        self._chat_buckets: Dict[Union[int, str], TokenBucket] = (
+            OrderedDict()
+        )
+        self.chat_rate = chat_rate
+        self.chat_capacity = chat_capacity
+        self._paused_until = 0.0
+        self._waiting = Counter()
+        self._chat_waiting: Dict[Union[int, str], Counter] = {}
+        self.max_retries = max_retries
+        self.metrics = Counter()
+
+    async def initialize(self) -> None:
+        """Do nothing."""
+
+    async def shutdown(self) -> None:
+        """Log the scheduling metrics."""
+        logger.info('Outbound requests: %s', dict(self.metrics))
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, JSONResult]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[int]
+    ) -> JSONResult:
+        """Make the request when the rate limits allow it."""
+        chat_id = data.get('chat_id')
+        if rate_limit_args is not None:
+            priority = rate_limit_args
+        elif endpoint in CLEANUP_ENDPOINTS:
+            priority = CLEANUP_PRIORITY
+        else:
+            priority = USER_REPLY_PRIORITY
+        chat_limited = not (
+            isinstance(chat_id, int)
+            and chat_id > 0
+            and endpoint in CLEANUP_ENDPOINTS | EDIT_ENDPOINTS
+        )
+
+        for attempt in range(self.max_retries + 1):
+            if chat_id is None:
+                await self._wait_for_pause()
+            else:
+                await self._acquire(chat_id, priority, chat_limited)
+
+            try:
+                self.metrics['requests'] += 1
+                return await callback(*args, **kwargs)
+            except RetryAfter as error:
+                self.metrics['retry_after'] += 1
+                if attempt == self.max_retries:
+                    raise
+                logger.info(
+                    'Rate limit hit, pausing requests for %s seconds',
+                    error.retry_after
+                )
+                self._paused_until = max(
+                    self._paused_until,
+                    time.monotonic() + error.retry_after
+                )
+
+    async def _wait_for_pause(self) -> None:
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _acquire(
+        self,
+        chat_id: Union[int, str],
+        priority: int,
+        chat_limited: bool
+    ) -> None:
+        chat_bucket = self._get_chat_bucket(chat_id) if chat_limited else None
+        chat_waiting = None
+        waiting_globally = False
+        try:
+            while True:
+                await self._wait_for_pause()
+                if chat_bucket:
+                    delay = chat_bucket.get_delay()
+                    if delay > 0 or has_waiting_before(
+                        self._chat_waiting.get(chat_id),
+                        priority
+                    ):
+                        # Counted until the request is sent, so requests
+                        # of the chat with a higher priority value wait.
+                        if chat_waiting is None:
+                            chat_waiting = self._chat_waiting.setdefault(
+                                chat_id,
+                                Counter()
+                            )
+                            chat_waiting[priority] += 1
+                            self.metrics['chat_delays'] += 1
+                        await asyncio.sleep(delay or 1 / chat_bucket.rate)
+                        continue
+
+                delay = self._global_bucket.get_delay()
+                if delay <= 0 and not has_waiting_before(
+                    self._waiting,
+                    priority
+                ):
+                    self._global_bucket.consume()
+                    if chat_bucket:
+                        chat_bucket.consume()
+                    return
+
+                if not waiting_globally:
+                    waiting_globally = True
+                    self._waiting[priority] += 1
+                    self.metrics['global_delays'] += 1
+                await asyncio.sleep(delay or 1 / self._global_bucket.rate)
+        finally:
+            if waiting_globally:
+                self._waiting[priority] -= 1
+            if chat_waiting is not None:
+                chat_waiting[priority] -= 1
+                if not any(chat_waiting.values()):
+                    del self._chat_waiting[chat_id]
+
+    def _get_chat_bucket(self, chat_id: Union[int, str]) -> TokenBucket:
+        chat_bucket = self._chat_buckets.get(chat_id)
+        if chat_bucket:
+            self._chat_buckets.move_to_end(chat_id)
+            return chat_bucket
+
+        if len(self._chat_buckets) >= MAX_CHAT_BUCKETS:
+            self._chat_buckets.popitem(last=False)
+        chat_bucket = TokenBucket(self.chat_rate, self.chat_capacity)
+        self._chat_buckets[chat_id] = chat_bucket
+        return chat_bucket
@@ -0,0 +1,112 @@
+# coding=utf-8
+"""Process updates of the wishlist-shop telegram bot concurrently."""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+
+def get_update_chat_id(update: object) -> Optional[int]:
+    """Return the id of the chat the update belongs to."""
+    if isinstance(update, Update) and update.effective_chat:
+        return update.effective_chat.id
+    return None
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Process updates of different chats concurrently.
+
+    Updates of the same chat wait for each other and are processed
+    strictly in the order of their arrival. Only the update being
+    processed takes a slot of max_concurrent_updates, so a chat
+    flooding the bot doesn't stall the other chats.
+    """
+
+    __slots__ = (
+        '_chat_locks', '_chat_queue_depths', 'max_queue_depth',
+        'processed_updates'
+    )
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max_concurrent_updates)
+        self._chat_locks: Dict[int, asyncio.Lock] = {}
+        self._chat_queue_depths: Dict[int, int] = {}
+        self.max_queue_depth = 0
+        self.processed_updates = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of updates being processed or waiting for their chat."""
+        return sum(self._chat_queue_depths.values())
+
+    def get_chat_queue_depth(self, chat_id: int) -> int:
+        """Number of updates of the chat being processed or waiting."""
+        return self._chat_queue_depths.get(chat_id, 0)
+
+    async def process_update(
+        self,
+        update: object,
+        coroutine: Awaitable[Any]
+    ) -> None:
+        """Wait for all earlier updates of the chat, then for a slot."""
+        chat_id = get_update_chat_id(update)
+        if chat_id is None:
+            await super().process_update(update, coroutine)
+            return
+
+        async with self.lock_chat(chat_id):
+            await super().process_update(update, coroutine)
+
+    @asynccontextmanager
+    async def lock_chat(self, chat_id: int) -> AsyncIterator[None]:
+        """Wait for all earlier updates of the chat and hold the later ones.
+
+        Lets jobs change the data of a chat as if they were its update.
+        """
+        chat_lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+        chat_queue_depth = self._chat_queue_depths.get(chat_id, 0) + 1
+        self._chat_queue_depths[chat_id] = chat_queue_depth
+        if chat_queue_depth > self.max_queue_depth:
+            self.max_queue_depth = chat_queue_depth
+        if chat_queue_depth > 1:
+            logger.debug(
+                'Chat %s has %s updates in queue', chat_id, chat_queue_depth
+            )
+
+        try:
+            async with chat_lock:
+                yield
+        finally:
+            chat_queue_depth = self._chat_queue_depths[chat_id] - 1
+            if chat_queue_depth:
+                self._chat_queue_depths[chat_id] = chat_queue_depth
+            else:
+                del self._chat_queue_depths[chat_id]
+                del self._chat_locks[chat_id]
+
+    async def do_process_update(
+        self,
+        update: object,
+        coroutine: Awaitable[Any]
+    ) -> None:
+        """Await the coroutine."""
+        try:
+            await coroutine
+        finally:
+            self.processed_updates += 1
+
+    async def initialize(self) -> None:
+        """Do nothing."""
+
+    async def shutdown(self) -> None:
+        """Log the queue metrics."""
+        logger.info(
+            'Processed %s updates, max chat queue depth %s',
+            self.processed_updates,
+            self.max_queue_depth
+        )
@@ -0,0 +1,147 @@
+# coding=utf-8
+"""Keep the dialogue state of a wishlist-shop telegram bot chat."""
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Union
+
+from bot.choices import LANGUAGES
+
+from .catalog import DEFAULT_LANGUAGE
+from .history import MessagesHistory
+
+# Chat languages stored as small numbers, their positions in LANGUAGES.
+Language = IntEnum(
+    'Language',
+    [language.upper() for language in LANGUAGES],
+    module=__name__
+)
+
+
+def get_language(language: Union[int, str]) -> Language:
+    """Return the Language of a number or a catalog name.
+
+    Unknown languages, e.g. removed from the catalog, are replaced with
+    the default language.
+    """
+    try:
+        if isinstance(language, int):
+            return Language(language)
+        return Language[language.upper()]
+    except (AttributeError, KeyError, ValueError):
+        return Language[DEFAULT_LANGUAGE.upper()]
+
+
+class ChatSession:
+    """Typed chat_data of a chat.
+
+    The language is stored as a Language number and is exposed by
+    its catalog name, e.g. 'russian'. Unset fields are None. Ids of
+    the messages waiting for deletion are kept when the dialogue is
+    cleared.
+    """
+
+    __slots__ = (
+        'next_state', '_language', 'messages_history', 'rendered_messages',
+        'impressions_menu', 'impression_id', 'receiving_method',
+        'customer_email', 'customer_fullname', 'customer_phone',
+        'delivery_method', 'recipient_name', 'recipient_contact',
+        'request_type', 'pending_deletions'
+    )
+
+    # Fields saved as they are, the others are converted in to_json.
+    PLAIN_FIELDS = (
+        'next_state', 'rendered_messages', 'impressions_menu',
+        'impression_id', 'receiving_method', 'customer_email',
+        'customer_fullname', 'customer_phone', 'delivery_method',
+        'recipient_name', 'recipient_contact', 'request_type'
+    )
+
+    def __init__(self):
+        self.pending_deletions: List[int] = []
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget the dialogue of the chat."""
+        self.next_state: Optional[int] = None
+        self._language: Optional[Language] = None
+        self.messages_history = MessagesHistory()
+        self.rendered_messages: Dict[str, str] = {}
+        self.impressions_menu: Optional[List] = None
+        self.impression_id: Optional[int] = None
+        self.receiving_method: Optional[str] = None
+        self.customer_email: Optional[str] = None
+        self.customer_fullname: Optional[str] = None
+        self.customer_phone: Optional[str] = None
+        self.delivery_method: Optional[str] = None
+        self.recipient_name: Optional[str] = None
+        self.recipient_contact: Optional[str] = None
+        self.request_type: Optional[str] = None
+
+    def load(self, session: 'ChatSession') -> None:
+        """Take all the fields of the session, e.g. read from Database."""
+        for field in self.__slots__:
+            setattr(self, field, getattr(session, field))
+
+    @property
+    def language(self) -> Optional[str]:
+        """Catalog name of the chat language."""
+        if self._language is None:
+            return None
+        return self._language.name.lower()
+
+    @language.setter
+    def language(self, language: Union[int, str, None]) -> None:
+        self._language = get_language(language) if language else None
+
+    @property
+    def language_id(self) -> Optional[Language]:
+        """Number of the chat language."""
+        return self._language
+
+    @classmethod
+    def from_json(cls, data: Optional[Dict[str, Any]]) -> 'ChatSession':
+        """Restore the session saved by to_json or a chat_data dict."""
+        session = cls()
+        if not data:
+            return session
+
+        for field in cls.PLAIN_FIELDS:
+            if data.get(field) is not None:
+                setattr(session, field, data[field])
+        session.messages_history = MessagesHistory.from_json(
+            data.get('messages_history')
+        )
+        session.pending_deletions = data.get('pending_deletions') or []
+
+        session.language = data.get('language')
+
+        # Chats saved before impressions were referenced in the catalog.
+        impressions_category = data.get('impressions_category')
+        if impressions_category and not session.impressions_menu:
+            session.impressions_menu = [impressions_category, 0, None]
+        return session
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return the set fields in JSON-compatible form."""
+        data = {
+            field: getattr(self, field)
+            for field in self.PLAIN_FIELDS
+            if getattr(self, field) not in (None, {})
+        }
+        if self._language is not None:
+            data['language'] = int(self._language)
+        if self.messages_history:
+            data['messages_history'] = self.messages_history.to_json()
+        if self.pending_deletions:
+            data['pending_deletions'] = list(self.pending_deletions)
+        return data
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ChatSession):
+            return NotImplemented
+        return all(
+            getattr(self, field) == getattr(other, field)
+            for field in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        return f'ChatSession({self.to_json()})'
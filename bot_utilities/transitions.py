@@ -0,0 +1,71 @@
+# coding=utf-8
+"""Compile the transitions table of the wishlist-shop telegram bot."""
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from . import states
+
+CALLBACK = 'callback'
+MESSAGE = 'message'
+ANY = None
+
+StateHandler = Callable[
+    [Update, ContextTypes.DEFAULT_TYPE],
+    Awaitable[Optional[int]]
+]
+CompiledTransitions = Dict[Tuple[int, str, Optional[str]], StateHandler]
+
+
+def get_all_states() -> Dict[int, str]:
+    """Return all the states declared in the states module."""
+    return {
+        value: name
+        for name, value in vars(states).items()
+        if name.isupper() and isinstance(value, int)
+    }
+
+
+def compile_transitions(transitions: Dict) -> CompiledTransitions:
+    """Flatten the transitions table into a dict with O(1) lookups.
+
+    The table maps a state to its inputs: the MESSAGE handler and
+    the CALLBACK handlers keyed by callback data (ANY for any data).
+    Raises ValueError if a state is not covered by the table.
+    """
+    all_states = get_all_states()
+    missing_states = [
+        name for state, name in all_states.items() if state not in transitions
+    ]
+    if missing_states:
+        raise ValueError(f'States without transitions: {missing_states}')
+
+    compiled_transitions = {}
+    for state, inputs in transitions.items():
+        if state not in all_states:
+            raise ValueError(f'Unknown state in transitions: {state}')
+        if MESSAGE not in inputs:
+            raise ValueError(
+                f'State {all_states[state]} has no message handler'
+            )
+
+        compiled_transitions[(state, MESSAGE, ANY)] = inputs[MESSAGE]
+        for data, handler in inputs.get(CALLBACK, {}).items():
+            compiled_transitions[(state, CALLBACK, data)] = handler
+
+    return compiled_transitions
+
+
+def resolve_handler(
+    transitions: CompiledTransitions,
+    state: int,
+    input_kind: str,
+    data: Optional[str],
+    default: StateHandler
+) -> StateHandler:
+    """Find the handler of the input in the compiled transitions."""
+    handler = transitions.get((state, input_kind, data))
+    if handler:
+        return handler
+    return transitions.get((state, input_kind, ANY), default)
@@ -0,0 +1,92 @@
+# coding=utf-8
+"""Receive updates of the wishlist-shop telegram bot via webhook."""
+import logging
+from typing import Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from telegram import Update
+from telegram.ext import Application
+
+from .application import build_application
+
+logger = logging.getLogger(__name__)
+
+webhook_application: Optional[Application] = None
+
+
+def get_webhook_application() -> Application:
+    """Return the bot application fed by the webhook view."""
+    global webhook_application
+    if webhook_application is None:
+        webhook_application = build_application(
+            settings.TELEGRAM_BOT_TOKEN,
+            webhook=True
+        )
+    return webhook_application
+
+
+async def start_webhook_application() -> None:
+    """Start the bot application and register the webhook in Telegram."""
+    if not settings.TELEGRAM_WEBHOOK_SECRET:
+        raise ImproperlyConfigured(
+            'TELEGRAM_WEBHOOK_SECRET is required with TELEGRAM_WEBHOOK_URL'
+        )
+
+    application = get_webhook_application()
+    await application.initialize()
+    # Unlike run_polling, start doesn't call post_init.
+    await application.post_init(application)
+    await application.bot.set_webhook(
+        url=settings.TELEGRAM_WEBHOOK_URL,
+        secret_token=settings.TELEGRAM_WEBHOOK_SECRET,
+        allowed_updates=Update.ALL_TYPES
+    )
+    await application.start()
+    logger.info('Webhook is set to %s', settings.TELEGRAM_WEBHOOK_URL)
+
+
+async def stop_webhook_application() -> None:
+    """Stop the bot application."""
+    application = get_webhook_application()
+    if application.running:
+        await application.stop()
+    await application.shutdown()
+
+
+async def put_webhook_update(data: dict) -> None:
+    """Put the update received by the webhook into the update queue."""
+    application = get_webhook_application()
+    update = Update.de_json(data, application.bot)
+    await application.update_queue.put(update)
+
+
+class WebhookLifespan:
+    """Run the bot application within the lifespan of the ASGI server."""
+
+    def __init__(self, asgi_application):
+        self.asgi_application = asgi_application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'lifespan':
+            await self.asgi_application(scope, receive, send)
+            return
+
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await start_webhook_application()
+                except Exception as error:
+                    logger.exception('Failed to start the bot application')
+                    await send({
+                        'type': 'lifespan.startup.failed',
+                        'message': str(error)
+                    })
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+
+            elif message['type'] == 'lifespan.shutdown':
+                await stop_webhook_application()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
@@ -3,14 +3,23 @@ ASGI config for impressions project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+When TELEGRAM_WEBHOOK_URL is set, the telegram bot application runs
+in the same process and receives updates from the webhook view.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'impressions.settings')
 
 application = get_asgi_application()
+
+if settings.TELEGRAM_WEBHOOK_URL:
+    from bot_utilities.webhook import WebhookLifespan
+
+    application = WebhookLifespan(application)
@@ -47,6 +47,10 @@ INSTALLED_APPS = [
     'bot'
 ]
 
+ADMIN_TRIGRAM_SEARCH = env.bool('ADMIN_TRIGRAM_SEARCH', False)
+if ADMIN_TRIGRAM_SEARCH:
+    INSTALLED_APPS.append('django.contrib.postgres')
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -85,6 +89,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Migrations are made on deployment, the test database is
+        # created from the models.
+        'TEST': {'MIGRATE': False},
     }
 }
 
@@ -136,3 +143,6 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Telegram bot
 TELEGRAM_BOT_TOKEN = env.str('TELEGRAM_BOT_TOKEN')
+TELEGRAM_WEBHOOK_URL = env.str('TELEGRAM_WEBHOOK_URL', '')
+TELEGRAM_WEBHOOK_SECRET = env.str('TELEGRAM_WEBHOOK_SECRET', '')
+TELEGRAM_OPERATOR_CHAT_ID = env.int('TELEGRAM_OPERATOR_CHAT_ID', None)
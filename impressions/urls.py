@@ -19,10 +19,11 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path
 
-from bot.views import empty_page
+from bot.views import empty_page, telegram_webhook
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('telegram/webhook/', telegram_webhook),
     path('', empty_page),
 ]
 